@@ -0,0 +1,173 @@
+"""
+Static server for the {prompt}_{model}.html artifacts.
+
+Each artifact is served at a content-hashed URL (/<hash>/<name>) with
+"Cache-Control: immutable", so browsers fetch it once and reuse it across
+reruns and visits; the plain /<name> URL is revalidated by ETag. Gzip
+(and brotli, if the brotli module is installed) variants are compressed
+once per file version. Point the app at it with ARTIFACT_BASE_URL:
+
+    python artifact_server.py --port 8901 &
+    ARTIFACT_BASE_URL=http://127.0.0.1:8901 streamlit run app.py
+"""
+import os
+import gzip
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import dashboard
+from normalize_artifacts import ARTIFACT_PATTERN, find_artifacts
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+class ArtifactStore:
+    """Served bytes and compressed variants per artifact, rebuilt when the file changes."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, name: str):
+        """Return {"digest", "variants"} for an artifact, or None if it doesn't exist."""
+        path = os.path.join(self.directory, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        version = (stat.st_size, stat.st_mtime_ns)
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry and entry["version"] == version:
+                return entry
+
+        with open(path, "r", encoding="utf-8") as f:
+            served = dashboard.served_artifact(f.read()).encode("utf-8")
+        variants = {"identity": served, "gzip": gzip.compress(served, 9, mtime=0)}
+        if brotli is not None:
+            variants["br"] = brotli.compress(served)
+        entry = {"version": version, "digest": dashboard.content_hash(served), "variants": variants}
+        with self.lock:
+            self.entries[name] = entry
+        return entry
+
+    def warm(self) -> int:
+        """Compress every artifact up front. Returns how many there are."""
+        names = find_artifacts(self.directory)
+        for name in names:
+            self.get(name)
+        return len(names)
+
+
+def accepted_encodings(header: str) -> set:
+    """Content codings the client accepts (ignoring ones with q=0)."""
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if coding.strip():
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def choose_encoding(header: str, available) -> str:
+    accepted = accepted_encodings(header or "")
+    for coding in ("br", "gzip"):
+        if coding in available and (coding in accepted or "*" in accepted):
+            return coding
+    return "identity"
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+class ArtifactHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    store = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_status(self, status: int, message: str) -> None:
+        body = message.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        parts = self.path.split("?")[0].strip("/").split("/")
+        name = parts[-1]
+        if len(parts) > 2 or not ARTIFACT_PATTERN.match(name):
+            self.send_status(404, "Not found")
+            return
+        entry = self.store.get(name)
+        # A hashed URL only ever serves the version it was minted for
+        if entry is None or (len(parts) == 2 and parts[0] != entry["digest"]):
+            self.send_status(404, "Not found")
+            return
+
+        encoding = choose_encoding(self.headers.get("Accept-Encoding"), entry["variants"])
+        etag = f'"{entry["digest"]}-{encoding}"'
+        not_modified = etag_matches(self.headers.get("If-None-Match"), etag)
+        self.send_response(304 if not_modified else 200)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", IMMUTABLE if len(parts) == 2 else REVALIDATE)
+        self.send_header("Vary", "Accept-Encoding")
+        if not_modified:
+            self.end_headers()
+            return
+        body = entry["variants"][encoding]
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve artifacts with immutable, precompressed responses")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--dir", default=dashboard.APP_DIR, help="Directory of artifacts (default: the app directory)")
+    args = parser.parse_args()
+
+    ArtifactHandler.store = ArtifactStore(args.dir)
+    count = ArtifactHandler.store.warm()
+    server = ThreadingHTTPServer((args.host, args.port), ArtifactHandler)
+    server.daemon_threads = True
+    encodings = "gzip, br" if brotli is not None else "gzip"
+    print(f"Serving {count} artifacts on http://{args.host}:{args.port} ({encodings})")
+    print(f"  export ARTIFACT_BASE_URL=http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
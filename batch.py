@@ -0,0 +1,245 @@
+"""
+Asynchronous batch submission for bulk runs.
+
+Instead of one synchronous call per cell, the requests for each
+(provider, model) are packed into one batch job, all jobs are polled
+together, and the results come back in the same {"content", "usage",
+"elapsed"} shape as providers.call(). Batch jobs are billed at a
+discount (costs.BATCH_DISCOUNT) and have their own, higher limits, but
+finish within hours rather than seconds, so "elapsed" is the job's
+turnaround, not a latency.
+
+OpenAI and DashScope (Qwen) use the OpenAI-compatible files + batches
+API (upload JSONL, poll, download the output file); Gemini takes inline
+requests via batchGenerateContent. Providers without a batch API
+(supports() is False) are called synchronously by the runners. A job
+that has been submitted is polled until it finishes, through transient
+errors; only a client error (e.g. an unknown job) abandons it.
+"""
+import io
+import json
+import time
+import requests
+import circuit
+import providers
+import response_cache
+
+# Batch protocol per provider
+BATCH_FORMATS = {
+    "openai": "openai",
+    "qwen": "openai",
+    "qwen-cn": "openai",
+    "gemini": "gemini",
+}
+
+POLL_INTERVAL = 30
+COMPLETION_WINDOW = "24h"
+
+# Terminal job states per protocol
+OPENAI_DONE = {"completed", "failed", "expired", "cancelled"}
+GEMINI_DONE = {"BATCH_STATE_SUCCEEDED", "BATCH_STATE_FAILED", "BATCH_STATE_CANCELLED", "BATCH_STATE_EXPIRED"}
+
+
+def supports(provider: str) -> bool:
+    return provider in BATCH_FORMATS
+
+
+def request_json(provider: str, method: str, url: str, **kwargs) -> dict:
+    """One batch-API HTTP call with the shared session and retries; returns the JSON body."""
+    response, _, _ = providers.send(
+        provider,
+        lambda: providers.get_session(provider).request(method, url, timeout=120, **kwargs),
+    )
+    if response.status_code != 200:
+        raise providers.ProviderError(provider, response.status_code, providers.error_message(response))
+    return response.json()
+
+
+def request_text(provider: str, url: str, headers: dict) -> str:
+    response, _, _ = providers.send(
+        provider,
+        lambda: providers.get_session(provider).get(url, headers=headers, timeout=120),
+    )
+    if response.status_code != 200:
+        raise providers.ProviderError(provider, response.status_code, providers.error_message(response))
+    return response.text
+
+
+def auth_headers(provider: str) -> dict:
+    if BATCH_FORMATS[provider] == "gemini":
+        return {"x-goog-api-key": providers.get_api_key(provider)}
+    return {"Authorization": f"Bearer {providers.get_api_key(provider)}"}
+
+
+def submit_openai(provider: str, model: str, bodies: dict) -> dict:
+    """Upload {custom_id: body} as a JSONL file and start a batch over it."""
+    base = providers.base_url(provider)
+    lines = [json.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body},
+                        ensure_ascii=False)
+             for custom_id, body in bodies.items()]
+    upload = request_json(provider, "POST", f"{base}/files", headers=auth_headers(provider),
+                          data={"purpose": "batch"},
+                          files={"file": (f"{model}.jsonl", io.BytesIO("\n".join(lines).encode("utf-8")),
+                                          "application/jsonl")})
+    job = request_json(provider, "POST", f"{base}/batches", headers=auth_headers(provider),
+                       json={"input_file_id": upload["id"], "endpoint": "/v1/chat/completions",
+                             "completion_window": COMPLETION_WINDOW})
+    return {"id": job["id"], "state": job.get("status")}
+
+
+def submit_gemini(provider: str, model: str, bodies: dict) -> dict:
+    """Start a batchGenerateContent job with the requests inline."""
+    base = providers.base_url(provider)
+    inline = [{"request": body, "metadata": {"key": custom_id}} for custom_id, body in bodies.items()]
+    job = request_json(provider, "POST", f"{base}/models/{model}:batchGenerateContent",
+                       headers=auth_headers(provider),
+                       json={"batch": {"display_name": f"benchmark-{model}",
+                                       "input_config": {"requests": {"requests": inline}}}})
+    return {"id": job["name"], "state": (job.get("metadata") or {}).get("state")}
+
+
+def poll_openai(provider: str, job: dict) -> bool:
+    data = request_json(provider, "GET", f"{providers.base_url(provider)}/batches/{job['id']}",
+                        headers=auth_headers(provider))
+    job["state"] = data["status"]
+    job["data"] = data
+    return data["status"] in OPENAI_DONE
+
+
+def poll_gemini(provider: str, job: dict) -> bool:
+    data = request_json(provider, "GET", f"{providers.base_url(provider)}/{job['id']}",
+                        headers=auth_headers(provider))
+    job["state"] = (data.get("metadata") or {}).get("state")
+    job["data"] = data
+    return bool(data.get("done")) or job["state"] in GEMINI_DONE
+
+
+def collect_openai(provider: str, job: dict) -> dict:
+    """{custom_id: (response body or None, error message or None)} from the output and error files."""
+    base = providers.base_url(provider)
+    outcomes = {}
+    for field in ("output_file_id", "error_file_id"):
+        file_id = job["data"].get(field)
+        if not file_id:
+            continue
+        for line in request_text(provider, f"{base}/files/{file_id}/content", auth_headers(provider)).splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            response = entry.get("response") or {}
+            if response.get("status_code") == 200:
+                outcomes[entry["custom_id"]] = (response["body"], None)
+            else:
+                error = entry.get("error") or (response.get("body") or {}).get("error") or {}
+                outcomes[entry["custom_id"]] = (None, error.get("message") or f"HTTP {response.get('status_code')}")
+    return outcomes
+
+
+def collect_gemini(provider: str, job: dict) -> dict:
+    data = job["data"]
+    output = data.get("response") or (data.get("metadata") or {}).get("output") or {}
+    outcomes = {}
+    for entry in (output.get("inlinedResponses") or {}).get("inlinedResponses", []):
+        key = (entry.get("metadata") or {}).get("key")
+        if "response" in entry:
+            outcomes[key] = (entry["response"], None)
+        else:
+            outcomes[key] = (None, (entry.get("error") or {}).get("message", "no response"))
+    return outcomes
+
+
+PROTOCOLS = {
+    "openai": (submit_openai, poll_openai, collect_openai),
+    "gemini": (submit_gemini, poll_gemini, collect_gemini),
+}
+
+
+def fail(group: dict, provider: str, error: Exception, results: dict) -> None:
+    """Record one error for every request of a job."""
+    if not isinstance(error, (providers.ProviderError, circuit.CircuitOpenError)):
+        error = providers.ProviderError(provider, None, str(error))
+    for custom_id in group:
+        results[custom_id] = error
+
+
+def unreadable(error: Exception) -> bool:
+    """True if polling a job failed for good (a client error such as an unknown job), not transiently."""
+    status = getattr(error, "status_code", None)
+    return status is not None and 400 <= status < 500 and status not in (408, 429)
+
+
+def run(calls: list, poll_interval: float = POLL_INTERVAL, on_done=None) -> dict:
+    """Run (custom_id, provider, model, prompt, trial) calls as batch jobs.
+
+    Requests already in the response cache are answered from it; the rest
+    are grouped into one job per (provider, model), submitted, and polled
+    together until every job is finished. on_done(custom_id, result) is
+    called as results arrive. Returns {custom_id: result or error}, where
+    the error is a ProviderError, or CircuitOpenError if the job could
+    not be submitted because the provider's circuit was open.
+    """
+    results = {}
+    groups = {}
+    for custom_id, provider, model, prompt, trial in calls:
+        build_request, _, _ = providers.FORMATS[providers.PROVIDERS[provider]["format"]]
+        url, _, body = build_request(provider, model, prompt, {})
+        key = response_cache.make_key(provider, model, url, body, trial)
+        cached = response_cache.get(key)
+        if cached:
+            results[custom_id] = {**cached["result"], "cached_at": cached["created_at"]}
+            if on_done:
+                on_done(custom_id, results[custom_id])
+            continue
+        groups.setdefault((provider, model), {})[custom_id] = (body, key)
+
+    jobs = []
+    for (provider, model), group in groups.items():
+        submit, _, _ = PROTOCOLS[BATCH_FORMATS[provider]]
+        try:
+            job = submit(provider, model, {custom_id: body for custom_id, (body, _) in group.items()})
+        except (providers.ProviderError, circuit.CircuitOpenError, requests.RequestException) as e:
+            fail(group, provider, e, results)
+            continue
+        job.update(provider=provider, model=model, requests=group, submitted=time.monotonic())
+        print(f"  [{provider}] Submitted batch {job['id']} ({len(group)} requests, {model})", flush=True)
+        jobs.append(job)
+
+    pending = list(jobs)
+    while pending:
+        time.sleep(poll_interval)
+        for job in list(pending):
+            provider = job["provider"]
+            _, poll, collect = PROTOCOLS[BATCH_FORMATS[provider]]
+            try:
+                if not poll(provider, job):
+                    continue
+                outcomes = collect(provider, job)
+            except circuit.CircuitOpenError:
+                # The job keeps running on the provider's side; check again once the circuit closes
+                continue
+            except (providers.ProviderError, requests.RequestException) as e:
+                if not unreadable(e):
+                    # The job is still running (and billed) on the provider's side, so keep polling it
+                    print(f"  [{provider}] Batch {job['id']}: {e}; polling again", flush=True)
+                    continue
+                print(f"  [{provider}] Batch {job['id']}: {e}; giving up on it", flush=True)
+                pending.remove(job)
+                fail(job["requests"], provider,
+                     providers.ProviderError(provider, e.status_code, f"batch {job['id']}: {e.message}"), results)
+                continue
+            pending.remove(job)
+            elapsed = time.monotonic() - job["submitted"]
+            print(f"  [{provider}] Batch {job['id']} {job['state']} after {elapsed:.0f}s", flush=True)
+            _, parse_response, _ = providers.FORMATS[providers.PROVIDERS[provider]["format"]]
+            for custom_id, (body, key) in job["requests"].items():
+                data, error = outcomes.get(custom_id, (None, f"batch {job['state']} without a result"))
+                if data is None:
+                    results[custom_id] = providers.ProviderError(provider, None, error)
+                    continue
+                content, usage = parse_response(data)
+                result = {"content": content, "usage": usage, "elapsed": elapsed, "batch_id": job["id"]}
+                response_cache.put(key, provider, job["model"], result)
+                results[custom_id] = result
+                if on_done:
+                    on_done(custom_id, result)
+    return results
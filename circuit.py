@@ -0,0 +1,96 @@
+"""
+Per-provider circuit breakers.
+
+After THRESHOLD consecutive failed calls (connection errors, timeouts
+or 5xx that outlast their retries) a provider's circuit opens, and
+further calls to it fail at once with CircuitOpenError instead of each
+waiting out its own timeouts and retries. While open, a lightweight
+health probe is tried every PROBE_INTERVAL seconds by the next call that
+comes along; if the provider answers, the circuit closes and calls go
+through again. The runners record calls skipped this way so --resume
+can retry them.
+"""
+import time
+import threading
+
+# Consecutive failed calls that open a circuit
+THRESHOLD = 3
+# Seconds between health probes while a circuit is open
+PROBE_INTERVAL = 30.0
+
+
+class CircuitOpenError(Exception):
+    """A call skipped because its provider's circuit is open."""
+
+    def __init__(self, provider: str, failures: int):
+        self.provider = provider
+        self.failures = failures
+        super().__init__(f"{provider} circuit open after {failures} consecutive failures; call skipped")
+
+
+class CircuitBreaker:
+    """Thread-safe breaker for one provider.
+
+    probe() should return True if the provider is reachable again.
+    """
+
+    def __init__(self, provider: str, probe):
+        self.provider = provider
+        self.probe = probe
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def before_attempt(self) -> None:
+        """Raise CircuitOpenError unless the circuit is closed (probing first if one is due)."""
+        with self.lock:
+            if self.opened_at is None:
+                return
+            if self.probing or time.monotonic() - self.opened_at < PROBE_INTERVAL:
+                raise CircuitOpenError(self.provider, self.failures)
+            self.probing = True
+        try:
+            healthy = self.probe()
+        except Exception:
+            healthy = False
+        with self.lock:
+            self.probing = False
+            if healthy:
+                print(f"  [{self.provider}] Health probe OK, circuit closed", flush=True)
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.opened_at = time.monotonic()
+            raise CircuitOpenError(self.provider, self.failures)
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.opened_at is None and self.failures >= THRESHOLD:
+                self.opened_at = time.monotonic()
+                print(f"  [{self.provider}] Circuit open after {self.failures} consecutive failures; "
+                      f"probing every {PROBE_INTERVAL:.0f}s", flush=True)
+
+
+def add_arguments(parser) -> None:
+    """Add the circuit-breaker switches to a runner's parser."""
+    parser.add_argument("--breaker-threshold", type=int, default=THRESHOLD, metavar="N",
+                        help=f"Consecutive failures that stop calls to a provider (default: {THRESHOLD})")
+    parser.add_argument("--probe-interval", type=float, default=PROBE_INTERVAL, metavar="SECONDS",
+                        help=f"Seconds between health probes of a stopped provider (default: {PROBE_INTERVAL:.0f})")
+
+
+def configure(args) -> None:
+    """Apply the parsed circuit-breaker switches."""
+    global THRESHOLD, PROBE_INTERVAL
+    THRESHOLD = max(1, args.breaker_threshold)
+    PROBE_INTERVAL = args.probe_interval
@@ -0,0 +1,165 @@
+"""
+Versioned pricing and vectorized cost/throughput aggregation.
+
+Prices are kept per version with the date they took effect, so old runs
+are priced at the rates of their day. aggregate() normalizes a batch of
+usage records once and then computes cost, token totals and throughput
+for all of them with NumPy, which stays fast for thousands of runs.
+
+    python costs.py    # per-model totals for stats.json and the text results
+"""
+import os
+import sys
+import json
+import numpy as np
+import usage as usage_lib
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Prices per 1M tokens (approximate), newest version last. Reasoning
+# tokens are billed at the output rate; cache hits at cached_input.
+PRICING_VERSIONS = [
+    {
+        "version": "2026-01",
+        "effective": "2026-01-01",
+        "prices": {
+            "gpt": {"input": 2.50, "cached_input": 0.25, "output": 10.00},      # GPT-5.2
+            "gemini": {"input": 1.25, "cached_input": 0.31, "output": 5.00},    # Gemini 3 Pro
+            "deepseek": {"input": 0.14, "cached_input": 0.014, "output": 0.28}, # DeepSeek V3.2
+            "qwen": {"input": 0.50, "cached_input": 0.10, "output": 2.00},      # Qwen3-Coder-Plus / Qwen3-Max
+            "kimi": {"input": 0.14, "cached_input": 0.035, "output": 0.28},     # Kimi K2.5
+        },
+    },
+]
+
+# Multiplier for calls made through a provider's batch API (records with a batch_id)
+BATCH_DISCOUNT = {"gpt": 0.5, "gemini": 0.5, "qwen": 0.5}
+
+PRICE_FIELDS = ("input", "cached_input", "output")
+FREE = {"input": 0.0, "cached_input": 0.0, "output": 0.0}
+
+
+def pricing_version(date: str = None) -> dict:
+    """The pricing version in effect on an ISO date (default: the latest)."""
+    if date is None:
+        return PRICING_VERSIONS[-1]
+    current = PRICING_VERSIONS[0]
+    for version in PRICING_VERSIONS:
+        if version["effective"] <= date[:10]:
+            current = version
+    return current
+
+
+def prices(model_key: str, date: str = None) -> dict:
+    return pricing_version(date)["prices"].get(model_key, FREE)
+
+
+def cost(model_key: str, usage: dict, date: str = None, batch: bool = False) -> float:
+    """Dollar cost of one call's raw usage (either schema), discounted if it ran in a batch."""
+    tokens = usage_lib.normalize(usage)
+    rate = prices(model_key, date)
+    uncached = tokens.input_tokens - tokens.cached_input_tokens
+    total = (uncached * rate["input"]
+             + tokens.cached_input_tokens * rate["cached_input"]
+             + tokens.billed_output_tokens * rate["output"]) / 1_000_000
+    return total * BATCH_DISCOUNT.get(model_key, 1.0) if batch else total
+
+
+def price_table() -> tuple:
+    """Return (effective dates, model keys, prices[version, model, field])."""
+    models = sorted({key for version in PRICING_VERSIONS for key in version["prices"]})
+    table = np.zeros((len(PRICING_VERSIONS), len(models), len(PRICE_FIELDS)))
+    for v, version in enumerate(PRICING_VERSIONS):
+        for m, key in enumerate(models):
+            rate = version["prices"].get(key, FREE)
+            table[v, m] = [rate[field] for field in PRICE_FIELDS]
+    effective = np.array([version["effective"] for version in PRICING_VERSIONS])
+    return effective, models, table
+
+
+def aggregate(records: list) -> dict:
+    """Cost, tokens and throughput for many calls in one vectorized pass.
+
+    Each record is a dict with "model", "usage" (raw, either schema) and
+    optionally "time_seconds", "date" (ISO; picks the pricing version)
+    and "batch_id" (batch-discounted).
+    Returns per-record arrays plus per-model totals under "by_model".
+    """
+    tokens = np.array([usage_lib.normalize(r.get("usage") or {}) for r in records],
+                      dtype=np.int64).reshape(-1, len(usage_lib.Usage._fields))
+    input_tokens, cached, output, reasoning = tokens.T
+    seconds = np.array([r.get("time_seconds") or np.nan for r in records], dtype=float)
+
+    effective, price_models, table = price_table()
+    model_keys = np.array([r["model"] for r in records], dtype=object)
+    known = {key: i for i, key in enumerate(price_models)}
+    model_index = np.array([known.get(key, -1) for key in model_keys], dtype=np.int64)
+    dates = np.array([(r.get("date") or effective[-1])[:10] for r in records])
+    version_index = np.clip(np.searchsorted(effective, dates, side="right") - 1, 0, len(effective) - 1)
+
+    rates = table[version_index, np.maximum(model_index, 0)]
+    rates[model_index < 0] = 0.0
+    billed_output = output + reasoning
+    discount = np.array([BATCH_DISCOUNT.get(r["model"], 1.0) if r.get("batch_id") else 1.0 for r in records])
+    cost_usd = ((input_tokens - cached) * rates[:, 0] + cached * rates[:, 1]
+                + billed_output * rates[:, 2]) / 1_000_000 * discount
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tokens_per_second = np.where(seconds > 0, billed_output / seconds, np.nan)
+
+    names, inverse = np.unique(model_keys.astype(str), return_inverse=True)
+    by_model = {}
+    for column, values in (("calls", np.ones(len(records))), ("cost", cost_usd),
+                           ("input_tokens", input_tokens), ("cached_input_tokens", cached),
+                           ("output_tokens", output), ("reasoning_tokens", reasoning),
+                           ("seconds", np.nan_to_num(seconds))):
+        totals = np.bincount(inverse, weights=values, minlength=len(names))
+        for name, total in zip(names, totals):
+            by_model.setdefault(str(name), {})[column] = float(total)
+    for totals in by_model.values():
+        generated = totals["output_tokens"] + totals["reasoning_tokens"]
+        totals["tokens_per_second"] = generated / totals["seconds"] if totals["seconds"] else None
+
+    return {
+        "model": model_keys,
+        "input_tokens": input_tokens,
+        "cached_input_tokens": cached,
+        "output_tokens": output,
+        "reasoning_tokens": reasoning,
+        "cost": cost_usd,
+        "tokens_per_second": tokens_per_second,
+        "by_model": by_model,
+    }
+
+
+def load_records(app_dir: str = APP_DIR) -> list:
+    """Usage records from stats.json and every {model}_text_results.json."""
+    records = []
+    stats_path = os.path.join(app_dir, "stats.json")
+    if os.path.exists(stats_path):
+        with open(stats_path, "r", encoding="utf-8") as f:
+            for models in json.load(f).values():
+                for model_key, stat in models.items():
+                    records.append({"model": model_key, **stat})
+    for name in sorted(os.listdir(app_dir)):
+        if name.endswith("_text_results.json"):
+            model_key = name[:-len("_text_results.json")]
+            with open(os.path.join(app_dir, name), "r", encoding="utf-8") as f:
+                for result in json.load(f).values():
+                    records.append({"model": model_key, **result})
+    return records
+
+
+def main():
+    totals = aggregate(load_records())["by_model"]
+    print("=" * 60)
+    print(f"Usage and cost by model (pricing {PRICING_VERSIONS[-1]['version']})")
+    print("=" * 60)
+    print(f"{'model':<10}{'calls':>6}{'input':>9}{'cached':>8}{'output':>9}{'reasoning':>11}{'cost':>10}")
+    for model_key, row in sorted(totals.items()):
+        print(f"{model_key:<10}{row['calls']:>6.0f}{row['input_tokens']:>9.0f}{row['cached_input_tokens']:>8.0f}"
+              f"{row['output_tokens']:>9.0f}{row['reasoning_tokens']:>11.0f}{'$' + format(row['cost'], '.4f'):>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+"""
+Dashboard data: the prompt/model manifest, result records and captions.
+
+Pure functions with no Streamlit dependency, so the app and any export
+share one definition of what each cell shows.
+"""
+import os
+import json
+import math
+import re
+import html
+import hashlib
+import costs
+import results_db
+import usage as usage_lib
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_FILE = os.path.join(APP_DIR, "manifest.json")
+STATS_FILE = os.path.join(APP_DIR, "stats.json")
+
+TITLE = "US-China AI Benchmark"
+BYLINE = "Created by Kyle Chan"
+
+# Page styling, shared by the app and the static export
+STYLE = """
+.block-container {
+    padding-top: 2rem;
+    max-width: 1600px;
+}
+.byline {
+    font-size: 1.1rem;
+    color: #6b7280;
+    margin-bottom: 1rem;
+}
+.prompt-box {
+    background-color: #f0f2f6;
+    padding: 0.8rem 1rem;
+    border-radius: 0.5rem;
+    font-size: 0.95rem;
+    margin-bottom: 1rem;
+}
+.model-header {
+    font-size: 1.3rem;
+    font-weight: 600;
+    margin-bottom: 0.5rem;
+}
+.response-box {
+    background-color: #ffffff;
+    border: 1px solid #e0e0e0;
+    padding: 0.8rem 1rem;
+    border-radius: 0.5rem;
+    font-size: 0.9rem;
+}
+.us-model {
+    border-left: 4px solid #3b82f6;
+}
+.china-model {
+    border-left: 4px solid #ef4444;
+}
+.censored {
+    background-color: #fef2f2;
+    color: #991b1b;
+    font-style: italic;
+}
+"""
+
+def read_json(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def artifact_path(prompt_key: str, model_key: str) -> str:
+    return os.path.join(APP_DIR, f"{prompt_key}_{model_key}.html")
+
+
+def text_results_path(model_key: str) -> str:
+    """Text-prompt answers live in {model}_text_results.json."""
+    return os.path.join(APP_DIR, f"{model_key}_text_results.json")
+
+
+def prompt_title(number: int, prompt: dict) -> str:
+    return f"Prompt {number} ({prompt['category']})"
+
+
+def sections(prompts: list) -> dict:
+    """Group prompts by category, in manifest order, as {category: [(number, prompt), ...]}."""
+    grouped = {}
+    for number, prompt in enumerate(prompts, 1):
+        grouped.setdefault(prompt["category"], []).append((number, prompt))
+    return grouped
+
+
+def model_name(model: dict, prompt: dict) -> str:
+    """Column header for a model (e.g. Qwen uses a coder model for coding prompts)."""
+    return model["names"][prompt["type"]]
+
+
+def box_class(model: dict, record: dict = None) -> str:
+    classes = f"response-box {model['region']}-model"
+    if record and record.get("censored"):
+        classes += " censored"
+    return classes
+
+
+def token_summary(usage: dict) -> str:
+    """"N in, M out", noting cached input and how much of the output was reasoning."""
+    tokens = usage_lib.normalize(usage)
+    summary = f"{tokens.input_tokens} in"
+    if tokens.cached_input_tokens:
+        summary += f" ({tokens.cached_input_tokens} cached)"
+    summary += f", {tokens.billed_output_tokens} out"
+    if tokens.reasoning_tokens:
+        summary += f" ({tokens.reasoning_tokens} reasoning)"
+    return summary
+
+
+def time_summary(record: dict) -> str:
+    """Wall-clock time, or the median and spread when the cell has repeated trials."""
+    if record.get("batch_id"):
+        return f"{record.get('time_seconds', 0):.0f}s batch turnaround"
+    summary = (record.get("trials") or {}).get("time_seconds")
+    if summary and summary["n"] > 1:
+        low, high = summary["ci95"]
+        return (f"{summary['p50']:.1f}s median (95% CI {low:.1f}-{high:.1f}s, "
+                f"p90 {summary['p90']:.1f}s, n={summary['n']})")
+    return f"{record.get('time_seconds', 0):.1f}s"
+
+
+def cold_summary(cold: dict) -> str:
+    """Time of the fresh-connection sample, with the part spent on connection setup."""
+    http = cold.get("http") or {}
+    setup = sum(http.get(k) or 0 for k in ("dns_seconds", "connect_seconds", "tls_seconds"))
+    summary = f"cold {cold.get('time_seconds', 0):.1f}s"
+    if setup:
+        summary += f" ({setup:.2f}s setup)"
+    return summary
+
+
+def hedge_summary(record: dict) -> str:
+    """" | hedged, served by <region>" when a hedged request was answered by another region."""
+    hedge = record.get("hedge") or {}
+    if not hedge.get("hedged"):
+        return ""
+    return f" | {hedge['reason']} hedge, served by {hedge['region']}"
+
+
+def cost_of(record: dict, model_key: str) -> float:
+    """Recorded cost if the record has one, otherwise priced from its usage."""
+    if "cost" in record:
+        return record["cost"]
+    return costs.cost(model_key, record.get("usage", {}), batch=bool(record.get("batch_id")))
+
+
+def format_cost(cost: float) -> str:
+    """Format a small dollar amount to two significant figures."""
+    if cost <= 0:
+        return "$0.00"
+    decimals = max(2, 1 - math.floor(math.log10(cost)))
+    text = f"{cost:.{decimals}f}".rstrip("0")
+    if len(text.split(".")[1]) < 2:
+        text = f"{cost:.2f}"
+    return f"${text}"
+
+
+def coding_caption(record: dict, model_key: str) -> str:
+    """Caption with cost, tokens, and time for a coding artifact."""
+    if record is None:
+        return "Stats not available"
+
+    cost = cost_of(record, model_key)
+
+    caption = f"Cost: ${cost:.4f} | {token_summary(record.get('usage', {}))} | {time_summary(record)}"
+
+    # Streaming runs break the wall-clock time into phases
+    if record.get("ttft_seconds") is not None:
+        caption += f" | TTFT {record['ttft_seconds']:.1f}s"
+    if record.get("reasoning_seconds") is not None:
+        caption += f" (reasoning {record['reasoning_seconds']:.1f}s)"
+    if record.get("tokens_per_second") is not None:
+        caption += f" | {record['tokens_per_second']:.0f} tok/s"
+    if record.get("cold"):
+        caption += f" | {cold_summary(record['cold'])}"
+    if record.get("prompt_layout"):
+        caption += f" | {record['prompt_layout'].replace('_', '-')} prompt"
+    return caption + hedge_summary(record)
+
+
+def text_caption(record: dict, model_key: str) -> str:
+    """Caption with cost and tokens (and time, when recorded) for a text answer."""
+    if record is None:
+        return "Stats not available"
+
+    usage = record.get("usage", {})
+    if record.get("rejected") or not usage:
+        caption = "Cost: $0.00 (rejected)"
+    else:
+        caption = f"Cost: {format_cost(cost_of(record, model_key))} ({token_summary(usage)})"
+    if record.get("time_seconds") is not None:
+        caption += f" | {time_summary(record)}"
+    return caption + hedge_summary(record)
+
+
+# Hand-curated fields in the results files
+CURATED_FIELDS = ("display", "censored", "rejected")
+
+
+def with_curation(record: dict, curated: dict = None) -> dict:
+    """Carry curated fields over to a newer record if it is still the same answer."""
+    if not curated or curated.get("response") != record.get("response"):
+        return record
+    return {**record, **{k: curated[k] for k in CURATED_FIELDS if k in curated}}
+
+
+def latest_results(db_file: str = None) -> dict:
+    """{"stats", "text"} for the latest recorded run of each cell in results.db (empty without one)."""
+    db_file = db_file or results_db.DB_FILE
+    if not os.path.exists(db_file):
+        return {"stats": {}, "text": {}}
+    db = results_db.ResultsDB(db_file, readonly=True)
+    try:
+        return {"stats": db.latest_stats(), "text": db.latest_text_results()}
+    finally:
+        db.close()
+
+
+def merge_stats(stats: dict, latest: dict) -> dict:
+    """Coding stats: the latest recorded run per cell, else stats.json."""
+    merged = {prompt: dict(models) for prompt, models in stats.items()}
+    for prompt, models in latest.items():
+        merged.setdefault(prompt, {}).update(models)
+    return merged
+
+
+def merge_text_results(results: dict, latest: dict) -> dict:
+    """Text answers: the latest recorded run per cell, else the model's results file."""
+    merged = dict(results)
+    for prompt, record in latest.items():
+        merged[prompt] = with_curation(record, results.get(prompt))
+    return merged
+
+
+def response_html(record: dict) -> str:
+    """HTML body for a text answer: the curated display text if set, else the raw response."""
+    text = record.get("display") or record.get("response", "")
+    return html.escape(text, quote=False).replace("\n", "<br>\n")
+
+
+# Embedding modes for coding artifacts
+EMBED_MODES = {
+    "lazy": "Play when visible",
+    "click": "Click to play",
+    "eager": "Play all at once",
+}
+
+# Injected into each artifact: requestAnimationFrame callbacks are held
+# while the parent says the frame is off-screen, which pauses the
+# animation without losing its state. The paused time is taken out of
+# the rAF timestamps and performance.now(), so on resume the animation
+# sees one ordinary frame step rather than the whole pause.
+PAUSE_SHIM = """<script>(function(){var raf=window.requestAnimationFrame.bind(window),
+now=performance.now.bind(performance),paused=false,pausedAt=0,offset=0,held=[];
+function run(cb){return raf(function(t){if(paused){held.push(cb);return;}cb(t-offset);});}
+performance.now=function(){return (paused?pausedAt:now())-offset;};
+window.requestAnimationFrame=function(cb){if(paused){held.push(cb);return 0;}return run(cb);};
+window.addEventListener("message",function(e){if(e.data==="pause"&&!paused){paused=true;pausedAt=now();}
+else if(e.data==="resume"&&paused){offset+=now()-pausedAt;paused=false;var q=held;held=[];q.forEach(run);}});})();</script>"""
+
+LAZY_TEMPLATE = """<!DOCTYPE html>
+<html><head><style>
+html, body {{ margin: 0; height: 100%; overflow: hidden; }}
+iframe {{ border: 0; width: 100%; height: 100%; display: block; }}
+button {{ position: absolute; inset: 0; margin: auto; width: 96px; height: 40px; border: 1px solid #d1d5db;
+  border-radius: 0.5rem; background: #f0f2f6; font: 600 14px sans-serif; cursor: pointer; }}
+</style></head>
+<body>
+<button id="play" hidden>&#9654; Play</button>
+<script id="artifact" type="application/json">{artifact}</script>
+<script>
+var mode = "{mode}", artifact = JSON.parse(document.getElementById("artifact").textContent);
+var play = document.getElementById("play"), frame = null, started = mode === "lazy", visible = false;
+function show() {{
+  if (!frame) {{
+    frame = document.createElement("iframe");
+    if (artifact.src) frame.src = artifact.src;
+    else frame.srcdoc = artifact.srcdoc;
+    document.body.appendChild(frame);
+  }} else {{
+    frame.contentWindow.postMessage("resume", "*");
+  }}
+  play.hidden = true;
+}}
+play.onclick = function () {{ started = true; show(); }};
+new IntersectionObserver(function (entries) {{
+  visible = entries[entries.length - 1].isIntersecting;
+  if (visible && started) show();
+  else if (visible) play.hidden = false;
+  else if (frame) frame.contentWindow.postMessage("pause", "*");
+}}, {{ rootMargin: "200px" }}).observe(document.body);
+</script>
+</body></html>"""
+
+
+def inject_head(document: str, snippet: str) -> str:
+    """Insert snippet at the start of <head> (or <html>), keeping the doctype first."""
+    lower = document.lower()
+    for tag in ("head", "html"):
+        match = re.search(rf"<{tag}[\s>]", lower)
+        if match:
+            end = lower.find(">", match.start())
+            return document[:end + 1] + snippet + document[end + 1:]
+    if lower.lstrip().startswith("<!doctype"):
+        end = lower.find(">")
+        return document[:end + 1] + snippet + document[end + 1:]
+    return snippet + document
+
+
+def served_artifact(document: str) -> str:
+    """The artifact as embedded: the source with the pause shim injected."""
+    return inject_head(document, PAUSE_SHIM)
+
+
+def content_hash(data: bytes) -> str:
+    """Short content hash used to version artifact URLs."""
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def artifact_url(base_url: str, prompt_key: str, model_key: str, digest: str) -> str:
+    """Immutable URL of an artifact on the artifact server."""
+    return f"{base_url.rstrip('/')}/{digest}/{prompt_key}_{model_key}.html"
+
+
+def lazy_frame(mode: str, **artifact) -> str:
+    """Wrapper page that mounts a child iframe (src= or srcdoc=) on demand."""
+    # Escape "<" so the artifact can't close the JSON <script> block early
+    return LAZY_TEMPLATE.format(artifact=json.dumps(artifact).replace("<", "\\u003c"), mode=mode)
+
+
+def embed_artifact(document: str, mode: str = "lazy") -> str:
+    """Wrap an artifact so it only starts when scrolled into view (or clicked).
+
+    "eager" returns the artifact unchanged. Otherwise the artifact is
+    mounted in a child iframe once it is near the viewport ("lazy") or
+    when Play is clicked ("click"), and its animation loop is paused
+    whenever it scrolls out of view.
+    """
+    if mode == "eager":
+        return document
+    return lazy_frame(mode, srcdoc=served_artifact(document))
@@ -0,0 +1,133 @@
+"""
+Export every recorded call from results.db as partitioned Parquet.
+
+One flat row per call (provider, model, prompt, token counts, timings,
+HTTP phase timings, cost, status), written as a Hive-partitioned dataset
+(provider=<p>/month=<YYYY-MM>/). Re-exporting replaces the partitions it
+writes. Analysis tools can memory-map the files and skip partitions and
+row groups that a filter rules out:
+
+    import pyarrow.dataset as ds
+    calls = ds.dataset("history", format="parquet", partitioning="hive")
+    calls.to_table(filter=(ds.field("provider") == "kimi") & (ds.field("month") >= "2026-01"))
+"""
+import os
+import sys
+import argparse
+import pyarrow as pa
+import pyarrow.dataset as ds
+import results_db
+
+SCHEMA = pa.schema([
+    ("run_id", pa.int64()),
+    ("call_id", pa.int64()),
+    ("runner", pa.string()),
+    ("finished_at", pa.timestamp("s", tz="UTC")),
+    ("prompt", pa.string()),
+    ("prompt_type", pa.string()),
+    ("category", pa.string()),
+    ("model", pa.string()),
+    ("trial", pa.int32()),
+    ("status", pa.string()),
+    ("input_tokens", pa.int64()),
+    ("cached_input_tokens", pa.int64()),
+    ("output_tokens", pa.int64()),
+    ("reasoning_tokens", pa.int64()),
+    ("time_seconds", pa.float64()),
+    ("ttfb_seconds", pa.float64()),
+    ("ttft_seconds", pa.float64()),
+    ("tokens_per_second", pa.float64()),
+    ("http_reused", pa.bool_()),
+    ("http_dns_seconds", pa.float64()),
+    ("http_connect_seconds", pa.float64()),
+    ("http_tls_seconds", pa.float64()),
+    ("http_upload_seconds", pa.float64()),
+    ("http_ttfb_seconds", pa.float64()),
+    ("http_transfer_seconds", pa.float64()),
+    ("http_bytes_sent", pa.int64()),
+    ("http_bytes_received", pa.int64()),
+    ("cost", pa.float64()),
+    ("provider", pa.string()),
+    ("month", pa.string()),
+])
+
+PARTITIONING = ds.partitioning(pa.schema([("provider", pa.string()), ("month", pa.string())]), flavor="hive")
+
+QUERY = """
+SELECT c.run_id, c.id AS call_id, r.runner, c.finished_at, c.prompt, p.type AS prompt_type,
+       p.category, c.model, c.trial, c.status, c.input_tokens, c.cached_input_tokens,
+       c.output_tokens, c.reasoning_tokens, c.time_seconds,
+       json_extract(c.stats, '$.ttfb_seconds') AS ttfb_seconds, c.ttft_seconds,
+       c.tokens_per_second, {http_columns}, c.cost, COALESCE(m.provider, c.model) AS provider,
+       substr(c.finished_at, 1, 7) AS month
+FROM calls c
+JOIN runs r ON r.id = c.run_id
+LEFT JOIN prompts p ON p.key = c.prompt
+LEFT JOIN models m ON m.key = c.model
+ORDER BY c.id
+""".format(http_columns=", ".join(
+    f"json_extract(c.stats, '$.http.{field}') AS http_{field}"
+    for field in ("reused", "dns_seconds", "connect_seconds", "tls_seconds", "upload_seconds",
+                  "ttfb_seconds", "transfer_seconds", "bytes_sent", "bytes_received")))
+
+
+def read_calls(db_path: str) -> pa.Table:
+    """All calls as one Arrow table, typed by SCHEMA."""
+    # Opening read-write brings an older database up to the current schema
+    db = results_db.ResultsDB(db_path)
+    try:
+        cursor = db.conn.execute(QUERY)
+        names = [column[0] for column in cursor.description]
+        columns = {name: [] for name in names}
+        for row in cursor:
+            for name, value in zip(names, row):
+                columns[name].append(value)
+    finally:
+        db.close()
+    arrays = {}
+    for field in SCHEMA:
+        if field.name == "finished_at":
+            # SQLite stores ISO strings; Arrow parses them into timestamps
+            arrays[field.name] = pa.array(columns[field.name], pa.string()).cast(field.type)
+        elif field.type == pa.bool_():
+            # JSON booleans come back from SQLite as 0/1
+            arrays[field.name] = pa.array([None if v is None else bool(v) for v in columns[field.name]],
+                                          field.type)
+        else:
+            arrays[field.name] = pa.array(columns[field.name], field.type)
+    return pa.table(arrays, schema=SCHEMA)
+
+
+def export(db_path: str, out_dir: str) -> pa.Table:
+    table = read_calls(db_path)
+    ds.write_dataset(
+        table,
+        out_dir,
+        format="parquet",
+        partitioning=PARTITIONING,
+        basename_template="calls-{i}.parquet",
+        existing_data_behavior="delete_matching",
+    )
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export results.db calls as partitioned Parquet")
+    parser.add_argument("--db", default=results_db.DB_FILE, help="Results database (default: results.db)")
+    parser.add_argument("--out", default=os.path.join(results_db.APP_DIR, "history"),
+                        help="Output directory (default: ./history)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"No results database at {args.db} (run a benchmark, or results_db.py --import)")
+        return 1
+    table = export(args.db, args.out)
+    partitions = sorted(set(zip(table.column("provider").to_pylist(), table.column("month").to_pylist())))
+    print(f"Exported {table.num_rows} calls to {args.out} ({len(partitions)} partitions)")
+    for provider, month in partitions:
+        print(f"  provider={provider}/month={month}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
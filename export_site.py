@@ -0,0 +1,233 @@
+"""
+Export the dashboard as a self-contained static site.
+
+Renders the same content as app.py (prompt boxes, model columns,
+captions, artifacts) from the manifest, result files and results.db
+into plain HTML.
+Assets and artifacts get content-hashed filenames, so a static host can
+serve them with a long immutable cache lifetime; only index.html needs
+revalidating.
+
+    python export_site.py --out site
+"""
+import os
+import sys
+import html
+import shutil
+import argparse
+import dashboard
+import journal
+
+# Layout the Streamlit page gets for free
+SITE_STYLE = """
+body {
+    margin: 0;
+    font-family: "Source Sans Pro", -apple-system, "Segoe UI", Roboto, sans-serif;
+    color: #31333f;
+}
+h1.title {
+    font-size: 2.75rem;
+    font-weight: 700;
+    margin: 0 0 1rem;
+}
+h1.prompt-title {
+    font-size: 20px;
+    font-weight: 600;
+    color: black;
+    margin: 0 0 1rem;
+}
+h2.section-title {
+    font-size: 1.6rem;
+    margin: 2rem 0 1rem;
+}
+.block-container {
+    margin: 0 auto;
+    padding: 2rem 1rem 4rem;
+}
+nav {
+    position: sticky;
+    top: 0;
+    z-index: 1;
+    background: #ffffff;
+    padding: 0.5rem 0;
+    border-bottom: 1px solid #e0e0e0;
+}
+nav a {
+    margin-right: 1.2rem;
+    color: #31333f;
+    font-weight: 600;
+    text-decoration: none;
+}
+.models {
+    display: grid;
+    gap: 1rem;
+}
+.models iframe {
+    width: 100%;
+    height: 400px;
+    border: 0;
+}
+.caption {
+    font-size: 0.875rem;
+    color: #808495;
+    margin: 0.25rem 0 0;
+}
+hr {
+    border: 0;
+    border-top: 1px solid #e0e0e0;
+    margin: 2rem 0;
+}
+"""
+
+# Pause artifacts that scroll out of view (see dashboard.PAUSE_SHIM)
+SITE_SCRIPT = """
+var observer = new IntersectionObserver(function (entries) {
+  entries.forEach(function (entry) {
+    if (entry.target.contentWindow) {
+      entry.target.contentWindow.postMessage(entry.isIntersecting ? "resume" : "pause", "*");
+    }
+  });
+}, { rootMargin: "200px" });
+document.querySelectorAll("iframe").forEach(function (frame) { observer.observe(frame); });
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="stylesheet" href="{stylesheet}">
+</head>
+<body>
+<div class="block-container">
+<h1 class="title">{title}</h1>
+<p class="byline">{byline}</p>
+<nav>{nav}</nav>
+{sections}
+</div>
+<script src="{script}" defer></script>
+</body>
+</html>
+"""
+
+
+class SiteWriter:
+    """Writes content-hashed files under an output directory, once per content."""
+
+    def __init__(self, out_dir: str):
+        self.out_dir = out_dir
+        self.written = {}
+
+    def write(self, subdir: str, stem: str, suffix: str, text: str) -> str:
+        """Write text as {subdir}/{stem}.{hash}{suffix}; returns its relative URL."""
+        data = text.encode("utf-8")
+        relative = f"{subdir}/{stem}.{dashboard.content_hash(data)}{suffix}"
+        if relative not in self.written:
+            os.makedirs(os.path.join(self.out_dir, subdir), exist_ok=True)
+            journal.write_atomic(os.path.join(self.out_dir, relative), text)
+            self.written[relative] = len(data)
+        return relative
+
+
+def slug(text: str) -> str:
+    return "".join(c if c.isalnum() else "-" for c in text.lower()).strip("-")
+
+
+def not_tested_cell(model: dict) -> str:
+    return (f'<div class="{dashboard.box_class(model)}"><em>Not yet tested</em></div>\n'
+            f'<p class="caption">Stats not available</p>')
+
+
+def coding_cell(prompt: dict, model: dict, stats: dict, writer: SiteWriter) -> str:
+    path = dashboard.artifact_path(prompt["key"], model["key"])
+    if not os.path.exists(path):
+        return not_tested_cell(model)
+    with open(path, "r", encoding="utf-8") as f:
+        served = dashboard.served_artifact(f.read())
+    url = writer.write("artifacts", f"{prompt['key']}_{model['key']}", ".html", served)
+    caption = dashboard.coding_caption(stats.get(prompt["key"], {}).get(model["key"]), model["key"])
+    return (f'<iframe src="{url}" loading="lazy" title="{html.escape(model["key"])}"></iframe>\n'
+            f'<p class="caption">{html.escape(caption)}</p>')
+
+
+def text_cell(prompt: dict, model: dict, text_results: dict) -> str:
+    record = text_results.get(model["key"], {}).get(prompt["key"])
+    if record is None:
+        return not_tested_cell(model)
+    caption = dashboard.text_caption(record, model["key"])
+    return (f'<div class="{dashboard.box_class(model, record)}">\n{dashboard.response_html(record)}\n</div>\n'
+            f'<p class="caption">{html.escape(caption)}</p>')
+
+
+def render_prompt(number: int, prompt: dict, models: list, stats: dict, text_results: dict,
+                  writer: SiteWriter) -> str:
+    columns = []
+    for model in models:
+        if prompt["type"] == "coding":
+            cell = coding_cell(prompt, model, stats, writer)
+        else:
+            cell = text_cell(prompt, model, text_results)
+        header = html.escape(dashboard.model_name(model, prompt))
+        columns.append(f'<div>\n<p class="model-header">{header}</p>\n{cell}\n</div>')
+    return (f'<h1 class="prompt-title">{html.escape(dashboard.prompt_title(number, prompt))}</h1>\n'
+            f'<div class="prompt-box">\n{html.escape(prompt["text"])}\n</div>\n'
+            f'<div class="models" style="grid-template-columns: repeat({len(models)}, minmax(0, 1fr));">\n'
+            + "\n".join(columns) + "\n</div>")
+
+
+def export(out_dir: str) -> SiteWriter:
+    """Render the whole dashboard into out_dir. Returns the writer (for its file list)."""
+    manifest = dashboard.read_json(dashboard.MANIFEST_FILE)
+    # Same sources as app.py: the latest results.db run per cell over the results files
+    latest = dashboard.latest_results()
+    stats = dashboard.read_json(dashboard.STATS_FILE) if os.path.exists(dashboard.STATS_FILE) else {}
+    stats = dashboard.merge_stats(stats, latest["stats"])
+    text_results = {}
+    for model in manifest["models"]:
+        path = dashboard.text_results_path(model["key"])
+        results = dashboard.read_json(path) if os.path.exists(path) else {}
+        text_results[model["key"]] = dashboard.merge_text_results(results, latest["text"].get(model["key"], {}))
+
+    # Hashed files from earlier exports are never referenced again
+    for subdir in ("assets", "artifacts"):
+        shutil.rmtree(os.path.join(out_dir, subdir), ignore_errors=True)
+
+    writer = SiteWriter(out_dir)
+    nav, sections = [], []
+    for category, prompts in dashboard.sections(manifest["prompts"]).items():
+        nav.append(f'<a href="#{slug(category)}">{html.escape(category)}</a>')
+        body = "\n<hr>\n".join(render_prompt(number, prompt, manifest["models"], stats, text_results, writer)
+                               for number, prompt in prompts)
+        sections.append(f'<section id="{slug(category)}">\n'
+                        f'<h2 class="section-title">{html.escape(category)}</h2>\n{body}\n</section>')
+
+    page = PAGE_TEMPLATE.format(
+        title=html.escape(dashboard.TITLE),
+        byline=html.escape(dashboard.BYLINE),
+        stylesheet=writer.write("assets", "style", ".css", dashboard.STYLE + SITE_STYLE),
+        script=writer.write("assets", "site", ".js", SITE_SCRIPT),
+        nav="".join(nav),
+        sections="\n<hr>\n".join(sections),
+    )
+    os.makedirs(out_dir, exist_ok=True)
+    journal.write_atomic(os.path.join(out_dir, "index.html"), page)
+    writer.written["index.html"] = len(page.encode("utf-8"))
+    return writer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the dashboard as a static site")
+    parser.add_argument("--out", default=os.path.join(dashboard.APP_DIR, "site"),
+                        help="Output directory (default: ./site)")
+    args = parser.parse_args()
+
+    writer = export(args.out)
+    total = sum(writer.written.values())
+    print(f"Exported {len(writer.written)} files ({total / 1024:.0f} KB) to {args.out}")
+    print("  Serve assets/ and artifacts/ with Cache-Control: immutable; revalidate index.html")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
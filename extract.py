@@ -0,0 +1,144 @@
+"""
+Linear-time HTML extraction from model responses, shared by all scripts.
+
+Finds the HTML document in a response (inside or outside ``` fences),
+falling back to wrapping a bare <canvas>...</script> fragment. Every
+search is a plain substring scan over the text, so a response is
+scanned a fixed number of times with no regex backtracking, even when
+the closing </html> is missing.
+"""
+
+DOCTYPE = "<!doctype html"
+HTML_OPEN = "<html"
+HTML_CLOSE = "</html>"
+CANVAS_OPEN = "<canvas"
+SCRIPT_CLOSE = "</script>"
+FENCE = "```"
+
+PARTIAL_TEMPLATE = '''<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+<style>* {{ margin: 0; padding: 0; }} body {{ background: #0a0a14; overflow: hidden; }} canvas {{ display: block; }}</style>
+</head>
+<body>
+{partial}
+</body>
+</html>'''
+
+
+def strip_fences(text: str) -> str:
+    """Drop a leading ```/```html line and a trailing ``` marker."""
+    text = text.strip()
+    if text.startswith(FENCE):
+        newline = text.find("\n")
+        first_line = text[3:newline if newline != -1 else len(text)].strip().lower()
+        if first_line in ("", "html"):
+            text = text[newline + 1:] if newline != -1 else ""
+    if text.endswith(FENCE):
+        text = text[:-3]
+    return text.strip()
+
+
+def find_document(text: str, lower: str):
+    """Return (start, end) of the first HTML document, or None.
+
+    end is None when the document never closes (a truncated response).
+    """
+    start = lower.find(DOCTYPE)
+    if start == -1:
+        start = lower.find(HTML_OPEN)
+    if start == -1:
+        return None
+    end = lower.find(HTML_CLOSE, start)
+    return start, (end + len(HTML_CLOSE) if end != -1 else None)
+
+
+def extract_html(response_text: str) -> str:
+    """Extract HTML from markdown code blocks or return as-is."""
+    text = response_text.strip()
+    lower = text.lower()
+
+    span = find_document(text, lower)
+    if span and span[1] is not None:
+        return text[span[0]:span[1]].strip()
+    if span:
+        # Unterminated document: keep everything from its start up to a closing fence
+        fence = lower.find(FENCE, span[0])
+        return text[span[0]:fence if fence != -1 else len(text)].strip()
+
+    # Try to find partial HTML (canvas + script) and wrap it
+    canvas = lower.find(CANVAS_OPEN)
+    if canvas != -1:
+        end = lower.find(SCRIPT_CLOSE, canvas)
+        if end != -1:
+            return PARTIAL_TEMPLATE.format(partial=text[canvas:end + len(SCRIPT_CLOSE)])
+    return strip_fences(text)
+
+
+def is_html_document(text: str) -> bool:
+    """True if text already starts with a doctype or <html> tag."""
+    head = text.lstrip()[:len(DOCTYPE)].lower()
+    return head.startswith(DOCTYPE[:9]) or head.startswith(HTML_OPEN)
+
+
+class StreamExtractor:
+    """Incremental extract_html() over a token stream.
+
+    feed() each chunk as it arrives; only the new chunk is lowercased and
+    scanned, plus a few characters of overlap for tags split across
+    chunks. done becomes True as soon as the document's closing </html>
+    arrives, so a caller can stop reading trailing prose early. Until
+    then a <!doctype is preferred over an earlier <html (which prose may
+    mention), as in extract_html(), so result() matches extract_html() on
+    the text fed so far unless a doctype only turns up after a complete
+    <html>...</html>.
+    """
+
+    # Characters of the previous chunk rescanned with the next one
+    OVERLAP = len(DOCTYPE) - 1
+
+    def __init__(self):
+        self.parts = []
+        self.length = 0
+        self.tail = ""
+        self.doctype = None
+        self.html = None
+        self.end = None
+
+    @property
+    def done(self) -> bool:
+        return self.end is not None
+
+    @property
+    def start(self):
+        return self.doctype if self.doctype is not None else self.html
+
+    def feed(self, chunk: str) -> None:
+        self.parts.append(chunk)
+        if self.done:
+            return
+        window = self.tail + chunk.lower()
+        offset = self.length - len(self.tail)
+        self.length += len(chunk)
+        self.tail = window[-self.OVERLAP:]
+        if self.doctype is None:
+            found = window.find(DOCTYPE)
+            if found != -1:
+                self.doctype = offset + found
+        if self.html is None:
+            found = window.find(HTML_OPEN)
+            if found != -1:
+                self.html = offset + found
+        if self.start is not None:
+            end = window.find(HTML_CLOSE, max(0, self.start - offset))
+            if end != -1:
+                self.end = offset + end + len(HTML_CLOSE)
+
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def result(self) -> str:
+        if self.done:
+            return self.text()[self.start:self.end].strip()
+        return extract_html(self.text())
@@ -0,0 +1,150 @@
+"""
+Hedged requests across a provider's regions.
+
+Providers with an "alternate" endpoint in providers.PROVIDERS (the
+DashScope US and China hosts) can be hedged: if the primary has not
+answered within a percentile of its recent latencies, the same request
+is sent to the alternate region, the first response wins, and the other
+is cancelled: it makes no further retries, its response is closed as
+soon as any of it arrives, and nothing from it is cached. Attempts run
+on daemon threads, so one still waiting for its response headers cannot
+hold up the end of a run. A primary that fails outright fails
+over to the alternate at once. The winning result carries a "hedge"
+record saying which region served it and why.
+"""
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+import numpy as np
+import providers
+
+# Hedge once the primary is slower than this percentile of its recent calls
+PERCENTILE = 90
+# Latencies kept per provider, and how many are needed before hedging on them
+WINDOW = 200
+MIN_SAMPLES = 5
+# Hedge delay while there are too few samples
+DEFAULT_DELAY = 120.0
+
+ENABLED = False
+
+_latencies = {}
+_latencies_lock = threading.Lock()
+
+
+def alternate(provider: str) -> str:
+    """The provider's other region, or None if it has only one."""
+    return providers.PROVIDERS[provider].get("alternate")
+
+
+def submit(fn, *args) -> Future:
+    """Run fn(*args) on a daemon thread, so an abandoned attempt cannot delay exit."""
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="hedge", daemon=True).start()
+    return future
+
+
+def observe(provider: str, seconds: float) -> None:
+    """Record a call's latency towards the provider's hedge delay."""
+    with _latencies_lock:
+        _latencies.setdefault(provider, deque(maxlen=WINDOW)).append(seconds)
+
+
+def hedge_delay(provider: str) -> float:
+    """Seconds to wait for the primary before hedging: PERCENTILE of its recent latencies."""
+    with _latencies_lock:
+        samples = list(_latencies.get(provider, ()))
+    if len(samples) < MIN_SAMPLES:
+        return DEFAULT_DELAY
+    return float(np.percentile(samples, PERCENTILE))
+
+
+def call(provider: str, attempt):
+    """Run attempt(provider, cancel) with hedging to the provider's alternate region.
+
+    attempt must return a providers.call()-style result; cancel is a
+    threading.Event that it should pass on to providers.call/stream_call. Returns the
+    first successful result, with "hedge": {region, hedged, reason,
+    delay_seconds, started_after_seconds}, and "elapsed" measured from the
+    first launch (its "timing" stays relative to the winning attempt).
+    Raises the primary's error if every region fails.
+    """
+    other = alternate(provider)
+    if not ENABLED or other is None:
+        return attempt(provider, None)
+
+    delay = hedge_delay(provider)
+    start = time.monotonic()
+    futures, cancels, launched_at = {}, {}, {}
+
+    def launch(region):
+        cancels[region] = threading.Event()
+        launched_at[region] = time.monotonic() - start
+        futures[submit(attempt, region, cancels[region])] = region
+
+    launch(provider)
+    reason = None
+    errors = {}
+    pending = set(futures)
+    while pending:
+        timeout = None if reason else max(0.0, delay - (time.monotonic() - start))
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            reason = "latency"
+            print(f"  [{provider}] No answer after {delay:.1f}s, hedging to {other}", flush=True)
+            launch(other)
+            pending = {f for f in futures if not f.done()}
+            continue
+        for future in done:
+            region = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                errors[region] = e
+                if other not in cancels:
+                    reason = "failover"
+                    print(f"  [{provider}] {e}; failing over to {other}", flush=True)
+                    launch(other)
+                    pending = {f for f in futures if not f.done()}
+                continue
+            for loser, cancel in cancels.items():
+                if loser != region:
+                    cancel.set()
+            if not result.get("cached_at"):
+                observe(region, result["elapsed"])
+            # Time from the caller's point of view, including the wait before hedging
+            elapsed = launched_at[region] + result["elapsed"]
+            return {**result, "elapsed": elapsed,
+                    "hedge": {"region": region, "hedged": reason is not None, "reason": reason,
+                              "delay_seconds": round(delay, 2),
+                              "started_after_seconds": round(launched_at[region], 2)}}
+    raise errors.get(provider) or next(iter(errors.values()))
+
+
+def configure(args, history: dict = None) -> None:
+    """Apply --hedge/--hedge-percentile; history seeds {provider: [seconds]} from earlier runs."""
+    global ENABLED, PERCENTILE
+    ENABLED = args.hedge
+    PERCENTILE = args.hedge_percentile
+    for provider, seconds in (history or {}).items():
+        for value in seconds:
+            observe(provider, value)
+
+
+def add_arguments(parser) -> None:
+    """Add the hedging switches to a runner's parser."""
+    parser.add_argument("--hedge", action="store_true",
+                        help="Hedge slow or failing Qwen calls to the other DashScope region")
+    parser.add_argument("--hedge-percentile", type=float, default=PERCENTILE, metavar="P",
+                        help=f"Hedge once a call is slower than this percentile of recent calls "
+                             f"(default: {PERCENTILE})")
@@ -0,0 +1,202 @@
+"""
+Per-phase timing for provider HTTP calls.
+
+TimedAdapter mounts urllib3 connection classes that time each phase of a
+request on the monotonic clock: DNS lookup, TCP connect and TLS handshake
+(only when a new connection is opened), request upload, time to the
+response headers (server think time plus one round trip), and body
+transfer. They also count bytes sent and received and whether the call
+reused a pooled connection, so network slowness can be told apart from
+provider slowness. phases() turns a finished requests.Response into the
+"http" record stored next to "usage", and prewarm() opens connections
+ahead of time so timed calls don't pay for setup.
+"""
+import time
+import socket
+import http.client
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+
+
+class CountingReader:
+    """Wraps a response's socket file, counting the bytes read from it."""
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.count = 0
+
+    def read(self, *args):
+        data = self.fp.read(*args)
+        self.count += len(data)
+        return data
+
+    def read1(self, *args):
+        data = self.fp.read1(*args)
+        self.count += len(data)
+        return data
+
+    def readline(self, *args):
+        data = self.fp.readline(*args)
+        self.count += len(data)
+        return data
+
+    def readinto(self, buffer):
+        n = self.fp.readinto(buffer)
+        self.count += n or 0
+        return n
+
+    def __getattr__(self, name):
+        return getattr(self.fp, name)
+
+
+class CountingHTTPResponse(http.client.HTTPResponse):
+    """http.client response that counts everything it reads, status line and headers included."""
+
+    def __init__(self, sock, *args, **kwargs):
+        super().__init__(sock, *args, **kwargs)
+        self.fp = CountingReader(self.fp)
+
+
+class TimedConnectionMixin:
+    """Records connection setup and per-request timings on a urllib3 connection."""
+
+    response_class = CountingHTTPResponse
+
+    def _new_conn(self) -> socket.socket:
+        # Resolve separately so DNS and TCP connect are timed apart; each
+        # address is tried in turn, as create_connection() would
+        start = time.monotonic()
+        try:
+            addresses = socket.getaddrinfo(self._dns_host, self.port, type=socket.SOCK_STREAM)
+        except socket.gaierror:
+            addresses = []
+        resolved = time.monotonic()
+        self.setup = {"dns_seconds": resolved - start}
+
+        host = self._dns_host
+        error = None
+        try:
+            for *_, address in addresses or [(None, (host,))]:
+                self._dns_host = address[0]
+                try:
+                    sock = super()._new_conn()
+                    break
+                except NewConnectionError as e:
+                    error = e
+            else:
+                raise error
+        finally:
+            self._dns_host = host
+        self.setup["connect_seconds"] = time.monotonic() - resolved
+        return sock
+
+    def connect(self) -> None:
+        start = time.monotonic()
+        super().connect()
+        total = time.monotonic() - start
+        setup = getattr(self, "setup", {})
+        tls = total - setup.get("dns_seconds", 0) - setup.get("connect_seconds", 0)
+        setup["tls_seconds"] = tls if isinstance(self, HTTPSConnection) else None
+        self.setup = setup
+        self.fresh = True
+
+    def send(self, data) -> None:
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            self.bytes_sent = getattr(self, "bytes_sent", 0) + len(data)
+        super().send(data)
+
+    def request(self, method, url, body=None, headers=None, **kwargs) -> None:
+        if self.sock is None:
+            # Connect up front so the upload phase doesn't include it
+            self.connect()
+        reused = not getattr(self, "fresh", False)
+        self.fresh = False
+        self.bytes_sent = 0
+        start = time.monotonic()
+        super().request(method, url, body=body, headers=headers, **kwargs)
+        self.timing = {
+            "reused": reused,
+            **({"dns_seconds": None, "connect_seconds": None, "tls_seconds": None} if reused else self.setup),
+            "upload_seconds": time.monotonic() - start,
+            "sent_at": time.monotonic(),
+        }
+
+    def getresponse(self):
+        response = super().getresponse()
+        timing = getattr(self, "timing", {})
+        timing["headers_at"] = time.monotonic()
+        timing["bytes_sent"] = self.bytes_sent
+        timing["reader"] = response._original_response.fp
+        response.phase_timing = timing
+        return response
+
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections record phase timings."""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+def prewarm(pool, connections: int) -> list:
+    """Open up to `connections` idle connections in a urllib3 pool.
+
+    Returns the setup timings of the connections that had to be opened.
+    Requests on them later count as reused, since they pay no setup.
+    """
+    taken = [pool._get_conn() for _ in range(min(connections, pool.pool.maxsize))]
+    setups = []
+    try:
+        for conn in taken:
+            if conn.sock is None:
+                conn.connect()
+                setups.append({k: round(v, 4) if v is not None else None for k, v in conn.setup.items()})
+            conn.fresh = False
+    finally:
+        for conn in taken:
+            pool._put_conn(conn)
+    return setups
+
+
+def phases(response, end: float) -> dict:
+    """The "http" record for a response whose body finished arriving at end (monotonic).
+
+    ttfb_seconds runs from the request being sent to the response headers;
+    bytes_sent and bytes_received are HTTP bytes on the wire (headers
+    included, body before decompression, excluding TLS framing). Setup
+    phases are None on a reused connection.
+    """
+    timing = getattr(response.raw, "phase_timing", None)
+    if timing is None:
+        return None
+    return {
+        "reused": timing["reused"],
+        **{k: round(timing[k], 4) if timing[k] is not None else None
+           for k in ("dns_seconds", "connect_seconds", "tls_seconds", "upload_seconds")},
+        "ttfb_seconds": round(timing["headers_at"] - timing["sent_at"], 4),
+        "transfer_seconds": round(end - timing["headers_at"], 4),
+        "bytes_sent": timing["bytes_sent"],
+        "bytes_received": timing["reader"].count,
+    }
@@ -0,0 +1,73 @@
+"""
+Append-only JSONL journal and atomic file writes for crash-safe runs.
+
+Each completed result is appended and fsynced as soon as it finishes,
+so an interrupted run loses at most the call that was in flight.
+"""
+import os
+import json
+import tempfile
+import threading
+from datetime import datetime, timezone
+
+_append_lock = threading.Lock()
+
+# mkstemp() files are private (0600); rewritten files get the usual mode instead.
+# The umask can only be read by setting it, so do that once, at import.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def append(path: str, record: dict) -> None:
+    """Append one record to the journal and fsync it to disk."""
+    record = {**record, "finished_at": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _append_lock:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def load(path: str) -> list:
+    """Read every complete record from a journal.
+
+    A torn last line (from a crash mid-write) is ignored.
+    """
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def reset(path: str) -> None:
+    """Start a fresh journal for a new run."""
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def write_atomic(path: str, text: str) -> None:
+    """Write a file via temp file + rename, so readers never see a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def write_json_atomic(path: str, data, **dump_kwargs) -> None:
+    """Atomically write data as JSON."""
+    write_atomic(path, json.dumps(data, **dump_kwargs))
@@ -0,0 +1,454 @@
+"""
+Local stand-in for every provider API, for offline load testing.
+
+Speaks OpenAI-compatible chat completions (plain and SSE streaming) and
+Gemini generateContent / streamGenerateContent, with configurable latency,
+token rate, error/429 injection and canned HTML bodies, plus the
+OpenAI-compatible files/batches API and Gemini batchGenerateContent for
+--batch runs. Point the runners at it with BENCHMARK_BASE_URL:
+
+    python mock_server.py --port 8900 &
+    BENCHMARK_BASE_URL=http://127.0.0.1:8900 python run_coding_prompts.py --no-cache --output-dir /tmp/mock-run
+"""
+import os
+import json
+import glob
+import math
+import time
+import uuid
+import random
+import argparse
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Defaults, overridden from the command line
+CONFIG = {
+    "latency_median": 2.0,       # seconds before the first token
+    "latency_sigma": 0.5,        # log-normal spread of that latency
+    "tokens_per_second": 200.0,  # decode speed
+    "reasoning_tokens": 0,       # streamed as reasoning_content before the answer
+    "error_rate": 0.0,           # fraction of requests answered with a 500
+    "rate_limit_rate": 0.0,      # fraction of requests answered with a 429
+    "retry_after": 1,            # Retry-After seconds sent with a 429
+    "html_dir": APP_DIR,         # canned bodies are picked from *.html here
+    "prompt_cache": False,       # report cached prompt tokens for repeated prefixes
+    "cache_block": 256,          # prefix cache granularity in characters (~64 tokens)
+    "batch_seconds": 5.0,        # time a batch job takes to complete
+}
+
+# (model, prompt prefix) blocks seen so far
+_prefixes = set()
+_prefixes_lock = threading.Lock()
+
+_bodies = []
+_bodies_lock = threading.Lock()
+
+# Uploaded/generated files and batch jobs, by id
+_files = {}
+_batches = {}
+_batches_lock = threading.Lock()
+
+
+def canned_bodies() -> list:
+    """Load the canned HTML bodies once."""
+    with _bodies_lock:
+        if not _bodies:
+            for path in sorted(glob.glob(os.path.join(CONFIG["html_dir"], "*.html"))):
+                with open(path, "r", encoding="utf-8") as f:
+                    _bodies.append(f.read())
+            if not _bodies:
+                _bodies.append("<!DOCTYPE html>\n<html><body><canvas></canvas></body></html>")
+        return _bodies
+
+
+def first_token_delay() -> float:
+    """Sample time-to-first-token from a log-normal distribution."""
+    return random.lognormvariate(math.log(CONFIG["latency_median"]), CONFIG["latency_sigma"])
+
+
+def make_answer() -> str:
+    """Return a canned answer, wrapped the way models usually wrap HTML."""
+    return f"```html\n{random.choice(canned_bodies())}\n```"
+
+
+def count_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def cached_tokens(model: str, prompt: str) -> int:
+    """Tokens of the longest block-aligned prefix this model has seen (then remember this prompt's)."""
+    if not CONFIG["prompt_cache"]:
+        return 0
+    ends = range(CONFIG["cache_block"], len(prompt) + 1, CONFIG["cache_block"])
+    blocks = [(model, prompt[:end]) for end in ends]
+    with _prefixes_lock:
+        hits = [end for end, block in zip(ends, blocks) if block in _prefixes]
+        _prefixes.update(blocks)
+    return hits[-1] // 4 if hits else 0
+
+
+def split_tokens(text: str, size: int = 16) -> list:
+    """Split text into stream deltas of roughly four tokens each."""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def openai_usage(prompt_tokens: int, completion_tokens: int, reasoning_tokens: int, cached: int = 0) -> dict:
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens + reasoning_tokens,
+        "total_tokens": prompt_tokens + completion_tokens + reasoning_tokens,
+        "prompt_tokens_details": {"cached_tokens": cached},
+        "completion_tokens_details": {"reasoning_tokens": reasoning_tokens},
+    }
+
+
+def gemini_usage(prompt_tokens: int, completion_tokens: int, reasoning_tokens: int, cached: int = 0) -> dict:
+    usage = {
+        "promptTokenCount": prompt_tokens,
+        "candidatesTokenCount": completion_tokens,
+        "totalTokenCount": prompt_tokens + completion_tokens + reasoning_tokens,
+    }
+    if reasoning_tokens:
+        usage["thoughtsTokenCount"] = reasoning_tokens
+    if cached:
+        usage["cachedContentTokenCount"] = cached
+    return usage
+
+
+def openai_completion(request: dict) -> tuple:
+    """Build a chat completion for a request; returns (response, seconds it would take)."""
+    prompt = " ".join(m.get("content", "") for m in request.get("messages", []))
+    answer = make_answer()
+    prompt_tokens, completion_tokens = count_tokens(prompt), count_tokens(answer)
+    reasoning_tokens = CONFIG["reasoning_tokens"]
+    response = {
+        "id": "mock",
+        "object": "chat.completion",
+        "model": request.get("model"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": answer},
+                     "finish_reason": "stop"}],
+        "usage": openai_usage(prompt_tokens, completion_tokens, reasoning_tokens,
+                              cached_tokens(request.get("model"), prompt)),
+    }
+    return response, first_token_delay() + (completion_tokens + reasoning_tokens) / CONFIG["tokens_per_second"]
+
+
+def gemini_prompt(request: dict) -> str:
+    return " ".join(part.get("text", "")
+                    for content in request.get("contents", [])
+                    for part in content.get("parts", []))
+
+
+def gemini_completion(model: str, request: dict) -> tuple:
+    """Build a generateContent response; returns (response, seconds it would take)."""
+    answer = make_answer()
+    prompt = gemini_prompt(request)
+    prompt_tokens, completion_tokens = count_tokens(prompt), count_tokens(answer)
+    reasoning_tokens = CONFIG["reasoning_tokens"]
+    response = {
+        "candidates": [{"content": {"role": "model", "parts": [{"text": answer}]},
+                        "finishReason": "STOP"}],
+        "usageMetadata": gemini_usage(prompt_tokens, completion_tokens, reasoning_tokens,
+                                      cached_tokens(model, prompt)),
+    }
+    return response, first_token_delay() + (completion_tokens + reasoning_tokens) / CONFIG["tokens_per_second"]
+
+
+def injected_failure() -> bool:
+    return random.random() < CONFIG["error_rate"]
+
+
+def run_openai_batch(batch_id: str) -> None:
+    """Answer every line of a batch's input file after batch_seconds."""
+    time.sleep(CONFIG["batch_seconds"])
+    with _batches_lock:
+        batch = _batches[batch_id]
+        lines = _files[batch["input_file_id"]]["content"].decode("utf-8").splitlines()
+    output, errors = [], []
+    for line in filter(None, lines):
+        entry = json.loads(line)
+        if injected_failure():
+            errors.append({"id": uuid.uuid4().hex, "custom_id": entry["custom_id"],
+                           "response": {"status_code": 500,
+                                        "body": {"error": {"message": "Internal error (mock)"}}},
+                           "error": None})
+            continue
+        body, _ = openai_completion(entry["body"])
+        output.append({"id": uuid.uuid4().hex, "custom_id": entry["custom_id"],
+                       "response": {"status_code": 200, "request_id": uuid.uuid4().hex, "body": body},
+                       "error": None})
+    with _batches_lock:
+        for field, entries in (("output_file_id", output), ("error_file_id", errors)):
+            if entries:
+                file_id = f"file-{uuid.uuid4().hex[:12]}"
+                content = "\n".join(json.dumps(e) for e in entries).encode("utf-8")
+                _files[file_id] = {"purpose": "batch_output", "content": content}
+                batch[field] = file_id
+        batch["status"] = "completed"
+        batch["request_counts"] = {"total": len(output) + len(errors), "completed": len(output),
+                                   "failed": len(errors)}
+
+
+def gemini_operation(job: dict) -> dict:
+    """A Gemini batch job as the long-running operation the API returns."""
+    operation = {"name": job["name"], "metadata": {"name": job["name"], "state": job["state"]},
+                 "done": job["state"] == "BATCH_STATE_SUCCEEDED"}
+    if operation["done"]:
+        operation["response"] = {"inlinedResponses": {"inlinedResponses": job["responses"]}}
+    return operation
+
+
+def run_gemini_batch(batch_id: str) -> None:
+    time.sleep(CONFIG["batch_seconds"])
+    with _batches_lock:
+        job = _batches[batch_id]
+    responses = []
+    for entry in job["requests"]:
+        if injected_failure():
+            responses.append({"metadata": entry.get("metadata", {}),
+                              "error": {"code": 13, "message": "Internal error (mock)"}})
+            continue
+        response, _ = gemini_completion(job["model"], entry["request"])
+        responses.append({"metadata": entry.get("metadata", {}), "response": response})
+    with _batches_lock:
+        job["state"] = "BATCH_STATE_SUCCEEDED"
+        job["responses"] = responses
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping keep-alive connections is normal, not an error
+        pass
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, data: dict, headers: dict = None) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def start_stream(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def send_event(self, data) -> None:
+        payload = data if isinstance(data, str) else json.dumps(data)
+        chunk = f"data: {payload}\n\n".encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        self.wfile.flush()
+
+    def end_stream(self) -> None:
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def injected_error(self) -> bool:
+        """Answer with an injected 429 or 500 if the dice say so."""
+        roll = random.random()
+        if roll < CONFIG["rate_limit_rate"]:
+            self.send_json(429, {"error": {"message": "Rate limit exceeded (mock)"}},
+                           {"Retry-After": str(CONFIG["retry_after"])})
+            return True
+        if roll < CONFIG["rate_limit_rate"] + CONFIG["error_rate"]:
+            self.send_json(500, {"error": {"message": "Internal error (mock)"}})
+            return True
+        return False
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        parts = path.strip("/").split("/")
+        with _batches_lock:
+            if len(parts) >= 3 and parts[-3] == "files" and parts[-1] == "content" and parts[-2] in _files:
+                body = _files[parts[-2]]["content"]
+                self.send_response(200)
+                self.send_header("Content-Type", "application/jsonl")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            if len(parts) >= 2 and parts[-2] == "batches" and parts[-1] in _batches:
+                batch = _batches[parts[-1]]
+                self.send_json(200, gemini_operation(batch) if "requests" in batch else batch)
+                return
+        self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def upload_file(self, body: bytes) -> None:
+        """Store a multipart/form-data upload (the OpenAI files API)."""
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode("utf-8") + body)
+        fields = {part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+                  for part in message.iter_parts()}
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        with _batches_lock:
+            _files[file_id] = {"purpose": fields.get("purpose", b"").decode("utf-8"), "content": fields["file"]}
+        self.send_json(200, {"id": file_id, "object": "file", "bytes": len(fields["file"]),
+                             "purpose": _files[file_id]["purpose"]})
+
+    def create_batch(self, request: dict) -> None:
+        if request.get("input_file_id") not in _files:
+            self.send_json(400, {"error": {"message": "Unknown input_file_id"}})
+            return
+        batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+        batch = {"id": batch_id, "object": "batch", "endpoint": request.get("endpoint"),
+                 "input_file_id": request["input_file_id"], "status": "in_progress",
+                 "created_at": int(time.time()), "output_file_id": None, "error_file_id": None}
+        with _batches_lock:
+            _batches[batch_id] = batch
+        threading.Thread(target=run_openai_batch, args=(batch_id,), daemon=True).start()
+        self.send_json(200, batch)
+
+    def gemini_batch(self, request: dict) -> None:
+        model = self.gemini_model()
+        batch_id = f"mock{uuid.uuid4().hex[:12]}"
+        job = {"name": f"batches/{batch_id}", "model": model, "state": "BATCH_STATE_PENDING",
+               "requests": request["batch"]["input_config"]["requests"]["requests"]}
+        with _batches_lock:
+            _batches[batch_id] = job
+            operation = gemini_operation(job)
+        threading.Thread(target=run_gemini_batch, args=(batch_id,), daemon=True).start()
+        self.send_json(200, operation)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        path = self.path.split("?")[0]
+
+        if path.endswith("/files"):
+            self.upload_file(body)
+            return
+        request = json.loads(body or b"{}")
+        if path.endswith("/batches"):
+            self.create_batch(request)
+            return
+        if path.endswith(":batchGenerateContent"):
+            self.gemini_batch(request)
+            return
+
+        if path.endswith("/chat/completions"):
+            handler = self.openai_chat
+        elif path.endswith(":generateContent"):
+            handler = self.gemini_generate
+        elif path.endswith(":streamGenerateContent"):
+            handler = self.gemini_stream
+        else:
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        if self.injected_error():
+            return
+        handler(request)
+
+    def openai_chat(self, request: dict) -> None:
+        if not request.get("stream"):
+            response, seconds = openai_completion(request)
+            time.sleep(seconds)
+            self.send_json(200, response)
+            return
+
+        prompt = " ".join(m.get("content", "") for m in request.get("messages", []))
+        answer = make_answer()
+        prompt_tokens, completion_tokens = count_tokens(prompt), count_tokens(answer)
+        reasoning_tokens = CONFIG["reasoning_tokens"]
+        usage = openai_usage(prompt_tokens, completion_tokens, reasoning_tokens,
+                             cached_tokens(request.get("model"), prompt))
+        rate = CONFIG["tokens_per_second"]
+
+        self.start_stream()
+        time.sleep(first_token_delay())
+        for _ in range(0, reasoning_tokens, 4):
+            self.send_event({"choices": [{"index": 0, "delta": {"reasoning_content": "hmm "}}]})
+            time.sleep(4 / rate)
+        for piece in split_tokens(answer):
+            self.send_event({"choices": [{"index": 0, "delta": {"content": piece}}]})
+            time.sleep(4 / rate)
+        if (request.get("stream_options") or {}).get("include_usage"):
+            self.send_event({"choices": [], "usage": usage})
+        self.send_event("[DONE]")
+        self.end_stream()
+
+    def gemini_model(self) -> str:
+        return self.path.split("?")[0].rsplit("/", 1)[-1].split(":")[0]
+
+    def gemini_generate(self, request: dict) -> None:
+        response, seconds = gemini_completion(self.gemini_model(), request)
+        time.sleep(seconds)
+        self.send_json(200, response)
+
+    def gemini_stream(self, request: dict) -> None:
+        answer = make_answer()
+        prompt = gemini_prompt(request)
+        prompt_tokens, completion_tokens = count_tokens(prompt), count_tokens(answer)
+        reasoning_tokens = CONFIG["reasoning_tokens"]
+        cached = cached_tokens(self.gemini_model(), prompt)
+        rate = CONFIG["tokens_per_second"]
+
+        self.start_stream()
+        # Gemini thinks silently, then streams the answer
+        time.sleep(first_token_delay() + reasoning_tokens / rate)
+        pieces = split_tokens(answer, 256)
+        for i, piece in enumerate(pieces):
+            chunk = {"candidates": [{"content": {"role": "model", "parts": [{"text": piece}]}}]}
+            if i == len(pieces) - 1:
+                chunk["usageMetadata"] = gemini_usage(prompt_tokens, completion_tokens, reasoning_tokens, cached)
+            self.send_event(chunk)
+            time.sleep(64 / rate)
+        self.end_stream()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the provider APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-median", type=float, default=CONFIG["latency_median"],
+                        help="Median seconds before the first token (log-normal)")
+    parser.add_argument("--latency-sigma", type=float, default=CONFIG["latency_sigma"],
+                        help="Log-normal sigma of the first-token latency")
+    parser.add_argument("--tokens-per-second", type=float, default=CONFIG["tokens_per_second"])
+    parser.add_argument("--reasoning-tokens", type=int, default=CONFIG["reasoning_tokens"],
+                        help="Reasoning tokens generated before each answer")
+    parser.add_argument("--error-rate", type=float, default=CONFIG["error_rate"],
+                        help="Fraction of requests that fail with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=CONFIG["rate_limit_rate"],
+                        help="Fraction of requests that fail with HTTP 429")
+    parser.add_argument("--retry-after", type=int, default=CONFIG["retry_after"])
+    parser.add_argument("--html-dir", default=CONFIG["html_dir"],
+                        help="Directory of canned *.html response bodies")
+    parser.add_argument("--prompt-cache", action="store_true",
+                        help="Report repeated prompt prefixes as cached tokens, like DeepSeek's 64-token cache")
+    parser.add_argument("--cache-block", type=int, default=CONFIG["cache_block"],
+                        help="Prompt cache granularity in characters")
+    parser.add_argument("--batch-seconds", type=float, default=CONFIG["batch_seconds"],
+                        help="Seconds before a submitted batch job completes")
+    args = parser.parse_args()
+
+    for key in CONFIG:
+        CONFIG[key] = getattr(args, key)
+
+    server = MockServer((args.host, args.port), MockHandler)
+    print(f"Mock provider API on http://{args.host}:{args.port} ({len(canned_bodies())} canned bodies)")
+    print(f"  export BENCHMARK_BASE_URL=http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
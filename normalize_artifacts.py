@@ -0,0 +1,93 @@
+"""
+Normalize every {prompt}_{model}.html artifact to a bare HTML document.
+
+Strips markdown fences and surrounding prose with the shared extractor,
+in parallel across a process pool. A manifest of (size, mtime, sha256)
+for files already known to be normalized lets unchanged files be
+skipped without being read, so re-running is near-instant.
+"""
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from extract import extract_html, is_html_document
+import journal
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_NAME = ".artifact_manifest.json"
+ARTIFACT_PATTERN = re.compile(r"^[a-z0-9]+_[a-z0-9]+\.html$")
+
+
+def find_artifacts(directory: str) -> list:
+    """Return the {prompt}_{model}.html filenames in a directory."""
+    return sorted(name for name in os.listdir(directory) if ARTIFACT_PATTERN.match(name))
+
+
+def normalize_file(path: str, dry_run: bool = False) -> tuple:
+    """Normalize one artifact in place. Returns (changed, sha256 of the final content)."""
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    normalized = extract_html(content)
+    # Whitespace-only differences are not worth a rewrite
+    changed = not is_html_document(content) or normalized.strip() != content.strip()
+    if changed and not dry_run:
+        journal.write_atomic(path, normalized)
+    final = normalized if changed else content
+    return changed, hashlib.sha256(final.encode("utf-8")).hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalize {prompt}_{model}.html artifacts")
+    parser.add_argument("--dir", default=APP_DIR, help="Directory of artifacts (default: the app directory)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-check every file, ignoring the manifest")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    args = parser.parse_args()
+
+    manifest_path = os.path.join(args.dir, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path) and not args.force:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    names = find_artifacts(args.dir)
+    to_check = []
+    for name in names:
+        stat = os.stat(os.path.join(args.dir, name))
+        entry = manifest.get(name)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            continue
+        to_check.append(name)
+
+    paths = [os.path.join(args.dir, name) for name in to_check]
+    changed = []
+    if paths:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(normalize_file, paths, [args.dry_run] * len(paths),
+                                    chunksize=max(1, len(paths) // 32)))
+        for name, path, (was_changed, digest) in zip(to_check, paths, results):
+            if was_changed:
+                changed.append(name)
+            if not (was_changed and args.dry_run):
+                stat = os.stat(path)
+                manifest[name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+
+    # Forget files that no longer exist
+    manifest = {name: manifest[name] for name in names if name in manifest}
+    if not args.dry_run:
+        journal.write_json_atomic(manifest_path, manifest, indent=2, sort_keys=True)
+
+    verb = "Would normalize" if args.dry_run else "Normalized"
+    for name in changed:
+        print(f"{verb} {name}")
+    print(f"\n{len(names)} artifacts: {len(names) - len(to_check)} skipped (unchanged since last run), "
+          f"{len(to_check)} checked, {len(changed)} {'to change' if args.dry_run else 'changed'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Prompt layout and reporting for provider-side prompt caching.
+
+Providers cache the longest prompt prefix they have recently seen
+(DeepSeek in 64-token blocks; OpenAI, Gemini and Qwen above a minimum
+prompt length), so instructions shared by every prompt belong at the
+front. cache_first() moves the shared SUFFIX there, and report()
+summarizes the cache hits and what they saved per model.
+
+    python prefix_cache.py    # cache hits recorded in stats.json
+"""
+import os
+import sys
+import json
+import costs
+import usage as usage_lib
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# "prompt_layout" of stats recorded with cache_first() prompts
+CACHE_FIRST = "cache_first"
+
+
+def cache_first(prompt: str, shared: str) -> str:
+    """Move a shared trailing instruction block to the front of a prompt.
+
+    Prompts that don't end with it are returned unchanged.
+    """
+    if not shared or not prompt.endswith(shared):
+        return prompt
+    return f"{shared.strip()}\n\n{prompt[:-len(shared)].strip()}"
+
+
+def report(records: list) -> dict:
+    """Per-model prompt-cache summary for a list of {"model", "usage", "time_seconds"} records.
+
+    Returns {model: {calls, input_tokens, cached_input_tokens, hit_ratio,
+    saved_usd, hit_seconds, miss_seconds}}, where hit/miss_seconds are the
+    mean call times with and without a cache hit (None if there were none).
+    """
+    summary = {}
+    for record in records:
+        tokens = usage_lib.normalize(record.get("usage"))
+        row = summary.setdefault(record["model"], {"calls": 0, "input_tokens": 0, "cached_input_tokens": 0,
+                                                   "saved_usd": 0.0, "_hits": [], "_misses": []})
+        row["calls"] += 1
+        row["input_tokens"] += tokens.input_tokens
+        row["cached_input_tokens"] += tokens.cached_input_tokens
+        rate = costs.prices(record["model"])
+        row["saved_usd"] += tokens.cached_input_tokens * (rate["input"] - rate["cached_input"]) / 1_000_000
+        if record.get("time_seconds") is not None:
+            row["_hits" if tokens.cached_input_tokens else "_misses"].append(record["time_seconds"])
+
+    for row in summary.values():
+        row["hit_ratio"] = row["cached_input_tokens"] / row["input_tokens"] if row["input_tokens"] else 0.0
+        hits, misses = row.pop("_hits"), row.pop("_misses")
+        row["hit_seconds"] = sum(hits) / len(hits) if hits else None
+        row["miss_seconds"] = sum(misses) / len(misses) if misses else None
+    return summary
+
+
+def print_report(summary: dict) -> None:
+    print(f"\n{'='*60}")
+    print("Prompt cache hits by model")
+    print(f"{'='*60}")
+    print(f"{'model':<10}{'calls':>6}{'cached/input':>16}{'hit %':>7}{'saved':>11}{'hit vs miss time':>20}")
+    for model_key, row in sorted(summary.items()):
+        if row["hit_seconds"] is not None and row["miss_seconds"] is not None:
+            times = f"{row['hit_seconds']:.1f}s vs {row['miss_seconds']:.1f}s"
+        else:
+            times = "-"
+        print(f"{model_key:<10}{row['calls']:>6}{row['cached_input_tokens']:>8}/{row['input_tokens']:<7}"
+              f"{row['hit_ratio'] * 100:>7.0f}{'$' + format(row['saved_usd'], '.5f'):>11}{times:>20}")
+
+
+def main():
+    with open(os.path.join(APP_DIR, "stats.json"), "r", encoding="utf-8") as f:
+        stats = json.load(f)
+    records = [{"model": model_key, **record} for models in stats.values() for model_key, record in models.items()]
+    print_report(report(records))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,469 @@
+"""
+Shared API clients for all benchmark providers.
+
+Each provider gets one pooled, keep-alive requests.Session, so repeated
+calls reuse warm connections instead of paying a new TCP+TLS handshake,
+and one circuit breaker (circuit.py), so calls to a provider that is down
+fail fast.
+Its connections time every request phase (see http_timing.py), and each
+result carries that breakdown under "http".
+"""
+import os
+import json
+import time
+import threading
+import contextlib
+import requests
+from dotenv import load_dotenv
+import circuit
+import http_timing
+import response_cache
+import retry
+import usage as usage_lib
+
+load_dotenv()
+
+# Connections kept open per provider (should cover the runner's concurrency)
+POOL_SIZE = 10
+
+PROVIDERS = {
+    "openai": {
+        "base_url": "https://api.openai.com/v1",
+        "api_key_env": "OPENAI_API_KEY",
+        "format": "openai",
+        "timeout": 300,
+        "params": {},
+    },
+    "gemini": {
+        "base_url": "https://generativelanguage.googleapis.com/v1beta",
+        "api_key_env": "GOOGLE_API_KEY",
+        "format": "gemini",
+        "timeout": 300,
+        "params": {},
+    },
+    "deepseek": {
+        "base_url": "https://api.deepseek.com",
+        "api_key_env": "DEEPSEEK_API_KEY",
+        "format": "openai",
+        "timeout": 300,
+        "params": {},
+    },
+    "kimi": {
+        "base_url": "https://api.moonshot.ai/v1",
+        "api_key_env": "KIMI_API_KEY",
+        "format": "openai",
+        "timeout": 300,
+        "params": {},
+    },
+    # DashScope US-Virginia endpoint
+    "qwen": {
+        "base_url": "https://dashscope-us.aliyuncs.com/compatible-mode/v1",
+        "api_key_env": "QWEN_API_KEY",
+        "format": "openai",
+        "timeout": 300,
+        "params": {},
+        "alternate": "qwen-cn",  # region used for hedging and failover (hedging.py)
+    },
+    # DashScope China (Beijing) endpoint
+    "qwen-cn": {
+        "base_url": "https://dashscope.aliyuncs.com/compatible-mode/v1",
+        "api_key_env": "QWEN_API_KEY",
+        "format": "openai",
+        "timeout": 300,
+        "params": {},
+        "alternate": "qwen",
+    },
+}
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+class ProviderError(Exception):
+    """A provider call that did not return a usable response."""
+
+    def __init__(self, provider: str, status_code, message: str):
+        self.provider = provider
+        self.status_code = status_code
+        self.message = message
+        super().__init__(f"Error {status_code}: {message}" if status_code else message)
+
+
+def get_session(provider: str) -> requests.Session:
+    """Return the shared keep-alive session for a provider."""
+    with _sessions_lock:
+        session = _sessions.get(provider)
+        if session is None:
+            session = requests.Session()
+            adapter = http_timing.TimedAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[provider] = session
+        return session
+
+
+def health_probe(provider: str) -> bool:
+    """Cheap reachability check: any HTTP answer below 500 from the model list counts as up."""
+    config = PROVIDERS[provider]
+    if config["format"] == "gemini":
+        headers = {"x-goog-api-key": get_api_key(provider)}
+    else:
+        headers = {"Authorization": f"Bearer {get_api_key(provider)}"}
+    response = get_session(provider).get(f"{base_url(provider)}/models", headers=headers, timeout=10)
+    response.close()
+    return response.status_code < 500
+
+
+def get_breaker(provider: str) -> circuit.CircuitBreaker:
+    """Return the shared circuit breaker for a provider."""
+    with _breakers_lock:
+        if provider not in _breakers:
+            _breakers[provider] = circuit.CircuitBreaker(provider, lambda: health_probe(provider))
+        return _breakers[provider]
+
+
+def send(provider: str, request_fn, tokens: int = 1, body_follows: bool = False) -> tuple:
+    """retry.send() behind the provider's circuit breaker.
+
+    The breaker can stop any attempt, but hears about the call only once,
+    after its retries: a connection error, timeout, 408 or 5xx counts as a
+    failure (rate limiting means the provider is up), anything else as a
+    success. With body_follows, a 200 is not counted yet; the caller reads
+    the body inside reading(), which records how that went.
+    """
+    breaker = get_breaker(provider)
+    try:
+        response, start, retries = retry.send(provider, request_fn, tokens, breaker=breaker)
+    except (requests.ConnectionError, requests.Timeout):
+        breaker.record_failure()
+        raise
+    if response.status_code == 408 or response.status_code >= 500:
+        breaker.record_failure()
+    elif response.status_code != 200 or not body_follows:
+        breaker.record_success()
+    return response, start, retries
+
+
+# Errors that can end a response body part-way through
+READ_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+
+@contextlib.contextmanager
+def reading(provider: str):
+    """Report whether a response body was read in full to the provider's circuit breaker."""
+    try:
+        yield
+    except READ_ERRORS:
+        get_breaker(provider).record_failure()
+        raise
+    get_breaker(provider).record_success()
+
+
+def prewarm(provider: str, connections: int = 1) -> list:
+    """Open keep-alive connections to a provider before any call is timed.
+
+    Uses the same connection pool that calls will (no request is sent).
+    Returns the DNS/connect/TLS timings of each connection opened.
+    """
+    url = base_url(provider)
+    session = get_session(provider)
+    settings = session.merge_environment_settings(url, {}, None, None, None)
+    request = session.prepare_request(requests.Request("POST", url))
+    pool = session.get_adapter(url).get_connection_with_tls_context(
+        request, settings["verify"], settings["proxies"], settings["cert"])
+    return http_timing.prewarm(pool, connections)
+
+
+def base_url(provider: str) -> str:
+    """Return a provider's base URL.
+
+    <PROVIDER>_BASE_URL (e.g. DEEPSEEK_BASE_URL, QWEN_CN_BASE_URL)
+    overrides one provider; BENCHMARK_BASE_URL points all of them at
+    one server, such as mock_server.py.
+    """
+    env_name = provider.upper().replace("-", "_") + "_BASE_URL"
+    return (os.getenv(env_name) or os.getenv("BENCHMARK_BASE_URL")
+            or PROVIDERS[provider]["base_url"]).rstrip("/")
+
+
+def get_api_key(provider: str) -> str:
+    """Read a provider's API key from the environment."""
+    env_name = PROVIDERS[provider]["api_key_env"]
+    api_key = os.getenv(env_name)
+    if not api_key:
+        if base_url(provider) != PROVIDERS[provider]["base_url"]:
+            # Overridden endpoints (e.g. the mock server) don't need a real key
+            return "mock"
+        raise ProviderError(provider, None, f"{env_name} not set")
+    return api_key
+
+
+def build_openai_request(provider: str, model: str, prompt: str, params: dict,
+                         stream: bool = False) -> tuple:
+    """Build (url, headers, body) for an OpenAI-compatible chat completion."""
+    config = PROVIDERS[provider]
+    url = f"{base_url(provider)}/chat/completions"
+    headers = {
+        "Authorization": f"Bearer {get_api_key(provider)}",
+        "Content-Type": "application/json",
+    }
+    body = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        **config["params"],
+        **params,
+    }
+    if stream:
+        body["stream"] = True
+        body["stream_options"] = {"include_usage": True}
+    return url, headers, body
+
+
+def build_gemini_request(provider: str, model: str, prompt: str, params: dict,
+                         stream: bool = False) -> tuple:
+    """Build (url, headers, body) for a Gemini generateContent call."""
+    config = PROVIDERS[provider]
+    if stream:
+        url = f"{base_url(provider)}/models/{model}:streamGenerateContent?alt=sse"
+    else:
+        url = f"{base_url(provider)}/models/{model}:generateContent"
+    headers = {
+        "x-goog-api-key": get_api_key(provider),
+        "Content-Type": "application/json",
+    }
+    body = {
+        "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+        **config["params"],
+        **params,
+    }
+    return url, headers, body
+
+
+def parse_openai(data: dict) -> tuple:
+    """Extract (content, usage) from an OpenAI-compatible response."""
+    content = data["choices"][0]["message"]["content"]
+    return content, data.get("usage", {})
+
+
+def parse_gemini(data: dict) -> tuple:
+    """Extract (content, usage) from a Gemini response."""
+    parts = data["candidates"][0]["content"]["parts"]
+    # Skip thought summaries if the model returns them
+    content = "".join(part.get("text", "") for part in parts if not part.get("thought"))
+    return content, data.get("usageMetadata", {})
+
+
+def parse_openai_chunk(chunk: dict) -> tuple:
+    """Extract (reasoning, content, usage) from an OpenAI-compatible stream chunk."""
+    usage = chunk.get("usage")
+    choices = chunk.get("choices") or []
+    if not choices:
+        return "", "", usage
+    choice = choices[0]
+    delta = choice.get("delta") or {}
+    # Moonshot reports usage on the final choice rather than the chunk
+    usage = usage or choice.get("usage")
+    return delta.get("reasoning_content") or "", delta.get("content") or "", usage
+
+
+def parse_gemini_chunk(chunk: dict) -> tuple:
+    """Extract (reasoning, content, usage) from a Gemini stream chunk."""
+    reasoning, content = "", ""
+    for candidate in chunk.get("candidates", [])[:1]:
+        for part in candidate.get("content", {}).get("parts", []):
+            if part.get("thought"):
+                reasoning += part.get("text", "")
+            else:
+                content += part.get("text", "")
+    return reasoning, content, chunk.get("usageMetadata")
+
+
+FORMATS = {
+    "openai": (build_openai_request, parse_openai, parse_openai_chunk),
+    "gemini": (build_gemini_request, parse_gemini, parse_gemini_chunk),
+}
+
+
+def error_message(response: requests.Response) -> str:
+    """Pull a readable error message out of a failed response."""
+    try:
+        error = response.json().get("error", {})
+    except ValueError:
+        return response.text
+    if isinstance(error, dict) and error.get("message"):
+        return error["message"]
+    return response.text
+
+
+def check_cancel(provider: str, cancel: threading.Event) -> None:
+    """Raise ProviderError if cancel has been set."""
+    if cancel is not None and cancel.is_set():
+        raise ProviderError(provider, None, "cancelled")
+
+
+def call(provider: str, model: str, prompt: str, timeout: float = None, trial: int = 0,
+         cancel: threading.Event = None, **params) -> dict:
+    """Send a single-turn prompt to a provider.
+
+    Extra keyword arguments are merged into the request body. Returns
+    {"content", "usage", "elapsed", "http"}; raises ProviderError on a missing
+    API key or a non-200 response, and circuit.CircuitOpenError while the
+    provider's circuit is open. Responses come from the response
+    cache when possible, with "cached_at" set to when they were made;
+    each trial number is cached separately. With cancel (e.g. for a hedged
+    request), the body is read in chunks, and setting cancel stops any
+    further retries, closes the response and raises ProviderError without
+    caching anything.
+    """
+    config = PROVIDERS[provider]
+    build_request, parse_response, _ = FORMATS[config["format"]]
+    url, headers, body = build_request(provider, model, prompt, params)
+
+    key = response_cache.make_key(provider, model, url, body, trial)
+    cached = response_cache.get(key)
+    if cached:
+        return {**cached["result"], "cached_at": cached["created_at"]}
+
+    def attempt():
+        # A cancelled request is not retried
+        check_cancel(provider, cancel)
+        return get_session(provider).post(
+            url,
+            headers=headers,
+            json=body,
+            timeout=timeout or config["timeout"],
+            stream=cancel is not None,
+        )
+
+    response, start, retries = send(provider, attempt, tokens=retry.estimate_tokens(prompt), body_follows=True)
+    with response, reading(provider):
+        if response.status_code != 200:
+            raise ProviderError(provider, response.status_code, error_message(response))
+        if cancel is not None:
+            chunks = []
+            for chunk in response.iter_content(chunk_size=16384):
+                check_cancel(provider, cancel)
+                chunks.append(chunk)
+            data = json.loads(b"".join(chunks))
+        else:
+            data = response.json()
+        end = time.monotonic()
+    check_cancel(provider, cancel)
+
+    content, usage = parse_response(data)
+    result = {"content": content, "usage": usage, "elapsed": end - start,
+              "http": http_timing.phases(response, end)}
+    record_usage(provider, parse_usage(provider, usage))
+    if retries:
+        result["retries"] = retries
+    response_cache.put(key, provider, model, result)
+    return result
+
+
+# Typed usage record for each response format
+USAGE_PARSERS = {
+    "openai": usage_lib.from_openai,
+    "gemini": usage_lib.from_gemini,
+}
+
+
+def parse_usage(provider: str, usage: dict) -> usage_lib.Usage:
+    """Normalize a provider's raw usage block."""
+    return USAGE_PARSERS[PROVIDERS[provider]["format"]](usage or {})
+
+
+def record_usage(provider: str, tokens: usage_lib.Usage) -> None:
+    """Charge a call's output tokens to the provider's tokens/minute bucket."""
+    retry.get_buckets(provider)[1].consume(tokens.billed_output_tokens)
+
+
+def stream_call(provider: str, model: str, prompt: str, timeout: float = None,
+                on_content=None, trial: int = 0, cancel: threading.Event = None, **params) -> dict:
+    """Send a single-turn prompt with server-sent events streaming.
+
+    Returns the same {"content", "usage", "elapsed", "http"} as call() (including
+    the response cache), plus a "timing" dict:
+    ttfb_seconds (first body byte), ttft_seconds (first answer token),
+    reasoning_seconds (first to last reasoning token, when the API
+    streams its reasoning), and tokens_per_second over the decode phase.
+    on_content, if given, is called with each answer delta as it arrives.
+    Setting cancel (e.g. when a hedged request lost) stops any further
+    retries, closes the stream and raises ProviderError without caching.
+    """
+    config = PROVIDERS[provider]
+    build_request, _, parse_chunk = FORMATS[config["format"]]
+    url, headers, body = build_request(provider, model, prompt, params, stream=True)
+
+    key = response_cache.make_key(provider, model, url, body, trial)
+    cached = response_cache.get(key)
+    if cached:
+        return {**cached["result"], "cached_at": cached["created_at"]}
+
+    def attempt():
+        # A cancelled request is not retried
+        check_cancel(provider, cancel)
+        return get_session(provider).post(
+            url,
+            headers=headers,
+            json=body,
+            timeout=timeout or config["timeout"],
+            stream=True,
+        )
+
+    response, start, retries = send(provider, attempt, tokens=retry.estimate_tokens(prompt), body_follows=True)
+    with response, reading(provider):
+        if response.status_code != 200:
+            raise ProviderError(provider, response.status_code, error_message(response))
+
+        first_byte = first_reasoning = first_content = None
+        content_parts = []
+        usage = {}
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            check_cancel(provider, cancel)
+            if first_byte is None:
+                first_byte = time.monotonic()
+            if not line or not line.startswith("data:"):
+                continue
+            payload = line[5:].strip()
+            if payload == "[DONE]":
+                break
+            reasoning, content, chunk_usage = parse_chunk(json.loads(payload))
+            now = time.monotonic()
+            if reasoning and first_reasoning is None:
+                first_reasoning = now
+            if content:
+                if first_content is None:
+                    first_content = now
+                content_parts.append(content)
+                if on_content:
+                    on_content(content)
+            if chunk_usage:
+                usage = chunk_usage
+        end = time.monotonic()
+    check_cancel(provider, cancel)
+
+    tokens = parse_usage(provider, usage)
+    if first_reasoning is not None:
+        # Reasoning is visible in the stream, so decoding starts with it
+        decode_start, decode_tokens = first_reasoning, tokens.billed_output_tokens
+    else:
+        decode_start, decode_tokens = first_content, tokens.output_tokens
+    decode_seconds = end - decode_start if decode_start is not None else 0
+
+    timing = {
+        "ttfb_seconds": round(first_byte - start, 2) if first_byte else None,
+        "ttft_seconds": round(first_content - start, 2) if first_content else None,
+        "reasoning_seconds": (round((first_content or end) - first_reasoning, 2)
+                              if first_reasoning is not None else None),
+        "tokens_per_second": round(decode_tokens / decode_seconds, 1) if decode_seconds > 0 else None,
+    }
+    result = {"content": "".join(content_parts), "usage": usage,
+              "elapsed": end - start, "timing": timing, "http": http_timing.phases(response, end)}
+    record_usage(provider, tokens)
+    if retries:
+        result["retries"] = retries
+    response_cache.put(key, provider, model, result)
+    return result
@@ -2,11 +2,8 @@
 Re-run DeepSeek prompts with higher token limit
 """
 import os
-import re
-import requests
-from dotenv import load_dotenv
-
-load_dotenv()
+import providers
+from extract import extract_html
 
 PROMPTS = {
     "animation": "Create an animation with three spinning hexagons that are nested one inside the next. Each hexagon is missing one side. There are little bouncy balls that start in the very center and bounce around until they fall out. Make the physics real with friction and bouncing. Don't use any external libraries. Make the final output fit in an 800x400 iframe.",
@@ -15,44 +12,11 @@ PROMPTS = {
     "traffic": "Simulate and animate urban traffic in a small city from a top-down view. The city is a graph of intersections and roads with traffic lights; vehicles are autonomous agents with random origins and destinations that move continuously and follow only local rules (speed limits, following distance, red lights). Traffic congestion must emerge naturally, with queues and stop-and-go waves, not hard-coded behavior. Midway through the simulation, change one policy variable (e.g., signal timing or road capacity) and make the system-level effect clearly visible. Don't use any external libraries. Make the final output fit in an 800x400 iframe.",
 }
 
-def extract_html(response_text):
-    """Extract HTML from markdown code blocks or return as-is."""
-    # Try to find HTML in code blocks
-    match = re.search(r'```html\s*(<!DOCTYPE html>.*?</html>)\s*```', response_text, re.DOTALL | re.IGNORECASE)
-    if match:
-        return match.group(1)
-    match = re.search(r'```(?:html)?\s*(<!DOCTYPE html>.*?</html>)\s*```', response_text, re.DOTALL | re.IGNORECASE)
-    if match:
-        return match.group(1)
-    # If response starts with <!DOCTYPE or <html, return as-is
-    if response_text.strip().lower().startswith('<!doctype') or response_text.strip().lower().startswith('<html'):
-        return response_text.strip()
-    # Last resort: find any HTML-like content
-    match = re.search(r'(<!DOCTYPE html>.*?</html>)', response_text, re.DOTALL | re.IGNORECASE)
-    if match:
-        return match.group(1)
-    return response_text
-
 def call_deepseek(prompt: str) -> dict:
     """Call DeepSeek API with higher token limit."""
-    api_key = os.getenv("DEEPSEEK_API_KEY")
-    response = requests.post(
-        "https://api.deepseek.com/chat/completions",
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        },
-        json={
-            "model": "deepseek-chat",
-            "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": 8192,  # Higher limit
-        },
-        timeout=180,
-    )
-    data = response.json()
-    content = data["choices"][0]["message"]["content"]
-    usage = data.get("usage", {})
-    return {"content": extract_html(content), "usage": usage}
+    result = providers.call("deepseek", "deepseek-chat", prompt, timeout=180,
+                            max_tokens=8192)  # Higher limit
+    return {"content": extract_html(result["content"]), "usage": result["usage"]}
 
 if __name__ == "__main__":
     app_dir = os.path.dirname(os.path.abspath(__file__))
@@ -0,0 +1,118 @@
+"""
+On-disk, content-addressed cache of provider responses.
+
+Entries are keyed by a hash of the provider, model, endpoint and full
+request body (prompt and params), so re-running an unchanged prompt
+reuses the stored response instead of paying for another API call.
+"""
+import os
+import json
+import time
+import hashlib
+import tempfile
+from datetime import datetime, timezone
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".response_cache")
+
+# Eviction limits applied by evict()
+MAX_AGE_DAYS = 30
+MAX_BYTES = 500 * 1024 * 1024
+
+# "use": read and write, "refresh": write only, "off": bypass entirely.
+# Off until a runner calls configure(), so scripts without the --no-cache /
+# --refresh switches always call the APIs.
+MODE = "off"
+
+
+def make_key(provider: str, model: str, url: str, body: dict, trial: int = 0) -> str:
+    """Hash everything that determines a response (never the API key).
+
+    Repeated trials of the same request are cached separately.
+    """
+    request = {"provider": provider, "model": model, "url": url, "body": body}
+    if trial:
+        request["trial"] = trial
+    blob = json.dumps(request, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _path(key: str) -> str:
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.json")
+
+
+def get(key: str) -> dict:
+    """Return the cached entry for a key, or None on a miss."""
+    if MODE != "use":
+        return None
+    try:
+        with open(_path(key), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def put(key: str, provider: str, model: str, result: dict) -> None:
+    """Store a result, recording when the response was made."""
+    if MODE == "off":
+        return
+    path = _path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    entry = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "provider": provider,
+        "model": model,
+        "result": result,
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def evict(max_age_days: float = MAX_AGE_DAYS, max_bytes: int = MAX_BYTES) -> int:
+    """Delete entries older than max_age_days, then the oldest until under max_bytes.
+
+    Returns the number of entries removed.
+    """
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+
+    entries = []
+    for dirpath, _, filenames in os.walk(CACHE_DIR):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+
+    cutoff = time.time() - max_age_days * 86400
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, path in entries:
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+        removed += 1
+    return removed
+
+
+def add_arguments(parser) -> None:
+    """Add the shared --no-cache / --refresh switches to a runner's parser."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--no-cache", action="store_true",
+                       help="Bypass the response cache entirely")
+    group.add_argument("--refresh", action="store_true",
+                       help="Ignore cached responses but store the new ones")
+
+
+def configure(args) -> None:
+    """Apply the parsed --no-cache / --refresh switches and evict stale entries."""
+    global MODE
+    MODE = "off" if args.no_cache else "refresh" if args.refresh else "use"
+    if MODE != "off":
+        evict()
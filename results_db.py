@@ -0,0 +1,290 @@
+"""
+SQLite results store that keeps every run.
+
+stats.json and the *_text_results.json files only hold the latest answer
+per cell; results.db keeps every call of every run. Runners record each
+call as it finishes, and the app reads the latest run per cell from here,
+falling back to the JSON files for cells that were never recorded.
+Responses are stored once per distinct content in the artifacts table.
+The database runs in WAL mode, so the app can read while a runner writes.
+
+    python results_db.py --import              # seed from stats.json and the text results
+    python results_db.py --history flow kimi   # time per run for one cell
+"""
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timezone
+import costs
+import trials
+import usage as usage_lib
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_FILE = os.path.join(APP_DIR, "results.db")
+MANIFEST_FILE = os.path.join(APP_DIR, "manifest.json")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    runner TEXT NOT NULL,
+    args TEXT,
+    started_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS prompts (
+    key TEXT PRIMARY KEY,
+    type TEXT,
+    category TEXT,
+    text TEXT
+);
+CREATE TABLE IF NOT EXISTS models (
+    key TEXT PRIMARY KEY,
+    provider TEXT,
+    region TEXT,
+    coding_name TEXT,
+    text_name TEXT
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    sha256 TEXT PRIMARY KEY,
+    content TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS calls (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    prompt TEXT NOT NULL REFERENCES prompts(key),
+    model TEXT NOT NULL REFERENCES models(key),
+    trial INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'ok',
+    finished_at TEXT NOT NULL,
+    time_seconds REAL,
+    ttft_seconds REAL,
+    tokens_per_second REAL,
+    input_tokens INTEGER,
+    cached_input_tokens INTEGER,
+    output_tokens INTEGER,
+    reasoning_tokens INTEGER,
+    cost REAL,
+    stats TEXT NOT NULL,
+    artifact TEXT REFERENCES artifacts(sha256)
+);
+CREATE INDEX IF NOT EXISTS calls_cell ON calls (prompt, model, run_id);
+"""
+
+def now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class ResultsDB:
+    """A connection to results.db, safe to share between threads."""
+
+    def __init__(self, path: str = DB_FILE, readonly: bool = False):
+        self.path = path
+        self.lock = threading.Lock()
+        if readonly:
+            # Readers must not write (even the schema), or every read would change the files
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30, check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            return
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA foreign_keys=ON")
+            self.conn.executescript(SCHEMA)
+        self.load_manifest()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def load_manifest(self, path: str = MANIFEST_FILE) -> None:
+        """Register the manifest's prompts and models (runners may add more)."""
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO prompts (key, type, category, text) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET type = excluded.type, category = excluded.category",
+                [(p["key"], p["type"], p["category"], p["text"]) for p in manifest["prompts"]])
+            self.conn.executemany(
+                "INSERT INTO models (key, provider, region, coding_name, text_name) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET provider = excluded.provider, region = excluded.region, "
+                "coding_name = excluded.coding_name, text_name = excluded.text_name",
+                [(m["key"], m.get("provider"), m["region"], m["names"]["coding"], m["names"]["text"])
+                 for m in manifest["models"]])
+
+    def start_run(self, runner: str, args: dict = None, resume: bool = False) -> int:
+        """Start a run; with resume, continue this runner's last unfinished run if there is one."""
+        with self.lock, self.conn:
+            if resume:
+                row = self.conn.execute("SELECT id FROM runs WHERE runner = ? AND finished_at IS NULL "
+                                        "ORDER BY id DESC LIMIT 1", (runner,)).fetchone()
+                if row:
+                    return row["id"]
+            cursor = self.conn.execute("INSERT INTO runs (runner, args, started_at) VALUES (?, ?, ?)",
+                                       (runner, json.dumps(args or {}, default=str), now()))
+            return cursor.lastrowid
+
+    def finish_run(self, run_id: int) -> None:
+        with self.lock, self.conn:
+            self.conn.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (now(), run_id))
+
+    def record_call(self, run_id: int, prompt: str, model: str, stats: dict, content: str = None,
+                    prompt_type: str = None, prompt_text: str = None, trial: int = 0,
+                    status: str = "ok") -> None:
+        """Store one finished call: its stats record and (deduplicated) response.
+
+        Only "ok" calls count towards a cell's results; "cold" marks a
+        fresh-connection sample taken alongside them, and "skipped" a call
+        not made because its provider's circuit was open.
+        """
+        tokens = usage_lib.normalize(stats.get("usage"))
+        cost = (stats["cost"] if "cost" in stats
+                else costs.cost(model, stats.get("usage") or {}, batch=bool(stats.get("batch_id"))))
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest() if content is not None else None
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO prompts (key, type, text) VALUES (?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+                "type = COALESCE(excluded.type, type), text = COALESCE(excluded.text, text)",
+                (prompt, prompt_type, prompt_text))
+            self.conn.execute("INSERT OR IGNORE INTO models (key) VALUES (?)", (model,))
+            if digest:
+                self.conn.execute("INSERT OR IGNORE INTO artifacts (sha256, content) VALUES (?, ?)",
+                                  (digest, content))
+            self.conn.execute(
+                "INSERT INTO calls (run_id, prompt, model, trial, status, finished_at, time_seconds, ttft_seconds, "
+                "tokens_per_second, input_tokens, cached_input_tokens, output_tokens, reasoning_tokens, "
+                "cost, stats, artifact) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, prompt, model, trial, status, now(), stats.get("time_seconds"), stats.get("ttft_seconds"),
+                 trials.sample_tokens_per_second(stats), *tokens, cost,
+                 json.dumps(stats, ensure_ascii=False), digest))
+
+    def latest_calls(self, prompt_type: str, status: str = "ok") -> dict:
+        """{(prompt, model): [rows]} for each cell's latest run, in trial order."""
+        rows = self.conn.execute(
+            "SELECT c.prompt, c.model, c.trial, c.stats, a.content, p.text AS prompt_text "
+            "FROM calls c "
+            "JOIN (SELECT prompt, model, MAX(run_id) AS run_id FROM calls WHERE status = ? "
+            "      GROUP BY prompt, model) latest "
+            "  ON c.prompt = latest.prompt AND c.model = latest.model AND c.run_id = latest.run_id "
+            "JOIN prompts p ON p.key = c.prompt "
+            "LEFT JOIN artifacts a ON a.sha256 = c.artifact "
+            "WHERE p.type = ? AND c.status = ? ORDER BY c.prompt, c.model, c.trial",
+            (status, prompt_type, status)).fetchall()
+        cells = {}
+        for row in rows:
+            cells.setdefault((row["prompt"], row["model"]), []).append(row)
+        return cells
+
+    def latest_stats(self) -> dict:
+        """Coding stats for the latest run of each cell, shaped like stats.json."""
+        stats = {}
+        for (prompt, model), rows in self.latest_calls("coding").items():
+            samples = [json.loads(row["stats"]) for row in rows]
+            stats.setdefault(prompt, {})[model] = samples[0] if len(samples) == 1 else trials.merge(samples)
+        for (prompt, model), rows in self.latest_calls("coding", status="cold").items():
+            if model in stats.get(prompt, {}):
+                stats[prompt][model]["cold"] = json.loads(rows[0]["stats"])
+        return stats
+
+    def latest_text_results(self) -> dict:
+        """Text answers for the latest run of each cell, as {model: {prompt: record}}."""
+        results = {}
+        for (prompt, model), rows in self.latest_calls("text").items():
+            records = [{"prompt": row["prompt_text"], "response": row["content"] or "",
+                        **json.loads(row["stats"])} for row in rows]
+            if len(records) > 1:
+                samples = [{"usage": r.get("usage", {}), "time_seconds": r.get("time_seconds")} for r in records]
+                records = [trials.merge(samples, base=records[0])]
+            results.setdefault(model, {})[prompt] = records[0]
+        return results
+
+    def recent_latencies(self, model: str, prompt_type: str, limit: int = 200) -> list:
+        """time_seconds of a model's latest successful calls of one prompt type."""
+        rows = self.conn.execute(
+            "SELECT c.time_seconds FROM calls c JOIN prompts p ON p.key = c.prompt "
+            "WHERE c.model = ? AND p.type = ? AND c.status = 'ok' AND c.time_seconds IS NOT NULL "
+            "AND json_extract(c.stats, '$.batch_id') IS NULL ORDER BY c.id DESC LIMIT ?",
+            (model, prompt_type, limit)).fetchall()
+        return [row["time_seconds"] for row in rows]
+
+    def history(self, prompt: str, model: str, limit: int = 20) -> list:
+        """Mean time and tokens/s (over trials) per run for one cell, newest first."""
+        rows = self.conn.execute(
+            "SELECT c.run_id, r.started_at, COUNT(*) AS calls, AVG(c.time_seconds) AS time_seconds, "
+            "AVG(c.tokens_per_second) AS tokens_per_second, SUM(c.cost) AS cost "
+            "FROM calls c JOIN runs r ON r.id = c.run_id "
+            "WHERE c.prompt = ? AND c.model = ? AND c.status = 'ok' GROUP BY c.run_id ORDER BY c.run_id DESC LIMIT ?",
+            (prompt, model, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+
+def import_json(db: ResultsDB, app_dir: str = APP_DIR) -> int:
+    """Record the current stats.json and *_text_results.json as one run. Returns calls added."""
+    run_id = db.start_run("import", {"app_dir": app_dir})
+    count = 0
+    stats_path = os.path.join(app_dir, "stats.json")
+    if os.path.exists(stats_path):
+        with open(stats_path, "r", encoding="utf-8") as f:
+            stats = json.load(f)
+        for prompt, models in stats.items():
+            for model, record in models.items():
+                html_path = os.path.join(app_dir, f"{prompt}_{model}.html")
+                content = None
+                if os.path.exists(html_path):
+                    with open(html_path, "r", encoding="utf-8") as f:
+                        content = f.read()
+                samples = (record.get("trials") or {}).get("samples") or [record]
+                for trial, sample in enumerate(samples):
+                    db.record_call(run_id, prompt, model, sample, content if trial == 0 else None,
+                                   prompt_type="coding", trial=trial)
+                    count += 1
+    for name in sorted(os.listdir(app_dir)):
+        if not name.endswith("_text_results.json"):
+            continue
+        model = name[:-len("_text_results.json")]
+        with open(os.path.join(app_dir, name), "r", encoding="utf-8") as f:
+            results = json.load(f)
+        for prompt, record in results.items():
+            stats = {k: v for k, v in record.items() if k not in ("prompt", "response", "trials")}
+            db.record_call(run_id, prompt, model, stats, record.get("response", ""),
+                           prompt_type="text", prompt_text=record.get("prompt"))
+            count += 1
+    db.finish_run(run_id)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or seed the results database")
+    parser.add_argument("--db", default=DB_FILE, help="Database file (default: results.db)")
+    parser.add_argument("--import", dest="import_json", action="store_true",
+                        help="Record stats.json and the text results as a new run")
+    parser.add_argument("--history", nargs=2, metavar=("PROMPT", "MODEL"),
+                        help="Show time per run for one prompt/model cell")
+    args = parser.parse_args()
+
+    db = ResultsDB(args.db)
+    if args.import_json:
+        print(f"Imported {import_json(db)} calls into {args.db}")
+    if args.history:
+        print(f"{'run':>5}  {'started':<26}{'calls':>6}{'time':>9}{'tok/s':>8}{'cost':>10}")
+        for row in db.history(*args.history):
+            tps = f"{row['tokens_per_second']:.0f}" if row["tokens_per_second"] is not None else "-"
+            print(f"{row['run_id']:>5}  {row['started_at']:<26}{row['calls']:>6}"
+                  f"{row['time_seconds'] or 0:>8.1f}s{tps:>8}{'$' + format(row['cost'] or 0, '.4f'):>10}")
+    if not (args.import_json or args.history):
+        for row in db.conn.execute("SELECT r.id, r.runner, r.started_at, COUNT(c.id) AS calls FROM runs r "
+                                   "LEFT JOIN calls c ON c.run_id = r.id GROUP BY r.id ORDER BY r.id"):
+            print(f"run {row['id']}: {row['runner']} at {row['started_at']} ({row['calls']} calls)")
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+Retry and rate-limit scheduling for provider calls.
+
+Transient failures (429, 5xx, dropped connections, connect timeouts) are
+retried with exponential backoff plus full jitter, honouring Retry-After.
+A read timeout is not: the attempt already waited the whole call timeout
+(minutes, for long generations), so it is raised at once. Each
+provider has token buckets for requests/minute and tokens/minute, and a
+run-wide retry budget stops a broken provider from retrying forever.
+"""
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+import requests
+
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Attempts per call, and retries allowed across the whole run
+MAX_ATTEMPTS = 5
+RUN_RETRY_BUDGET = 50
+
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+# Per-provider rate limits (requests/minute, tokens/minute). Set these
+# at or a little below the account's actual tier limits.
+LIMITS = {
+    "openai": {"rpm": 500, "tpm": 500_000},
+    "gemini": {"rpm": 150, "tpm": 1_000_000},
+    "deepseek": {"rpm": 60, "tpm": 1_000_000},
+    "kimi": {"rpm": 60, "tpm": 500_000},
+    "qwen": {"rpm": 60, "tpm": 1_000_000},
+    "qwen-cn": {"rpm": 60, "tpm": 1_000_000},
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket that refills continuously at rate_per_minute."""
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = rate_per_minute
+        self.rate = rate_per_minute / 60.0
+        self.tokens = rate_per_minute
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount: float = 1) -> float:
+        """Block until amount is available, then take it. Returns seconds waited."""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def consume(self, amount: float) -> None:
+        """Take tokens without waiting (may go negative, delaying later calls)."""
+        with self.lock:
+            self._refill()
+            self.tokens -= amount
+
+
+class RetryBudget:
+    """A run-wide cap on the total number of retries."""
+
+    def __init__(self, max_retries: int):
+        self.remaining = max_retries
+        self.lock = threading.Lock()
+
+    def spend(self) -> bool:
+        """Use one retry; returns False once the budget is exhausted."""
+        with self.lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+budget = RetryBudget(RUN_RETRY_BUDGET)
+
+
+def get_buckets(provider: str) -> tuple:
+    """Return the (requests, tokens) buckets for a provider."""
+    with _buckets_lock:
+        if provider not in _buckets:
+            limits = LIMITS.get(provider, {"rpm": 60, "tpm": 1_000_000})
+            _buckets[provider] = (TokenBucket(limits["rpm"]), TokenBucket(limits["tpm"]))
+        return _buckets[provider]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate for rate limiting (about 4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def retry_after(response: requests.Response):
+    """Parse a Retry-After header (seconds or HTTP date), or None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for the given (0-based) retry."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+def send(provider: str, request_fn, tokens: int = 1, breaker=None) -> tuple:
+    """Send a request with rate limiting and retries.
+
+    request_fn() performs one HTTP attempt and returns a Response. Returns
+    (response, attempt_start, retries), where attempt_start is the
+    monotonic time the final attempt began, so callers can time only the
+    attempt that produced the response. Non-retryable responses are
+    returned as-is; the last error is raised once retries run out.
+    If breaker (a circuit.CircuitBreaker) is given, it is checked before
+    every attempt and can stop the call with CircuitOpenError; recording
+    the call's outcome is left to the caller, once retries are over.
+    """
+    request_bucket, token_bucket = get_buckets(provider)
+    attempt = 0
+    while True:
+        if breaker:
+            breaker.before_attempt()
+        request_bucket.acquire(1)
+        token_bucket.acquire(tokens)
+        attempt_start = time.monotonic()
+        try:
+            response = request_fn()
+        except requests.ReadTimeout:
+            raise
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt + 1 >= MAX_ATTEMPTS or not budget.spend():
+                raise
+            delay = backoff_delay(attempt)
+            print(f"  [{provider}] {type(e).__name__}, retrying in {delay:.1f}s", flush=True)
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                return response, attempt_start, attempt
+            if attempt + 1 >= MAX_ATTEMPTS or not budget.spend():
+                return response, attempt_start, attempt
+            delay = retry_after(response)
+            if delay is None:
+                delay = backoff_delay(attempt)
+            response.close()
+            print(f"  [{provider}] HTTP {response.status_code}, retrying in {delay:.1f}s", flush=True)
+        time.sleep(delay)
+        attempt += 1
+
+
+def add_arguments(parser) -> None:
+    """Add the shared retry switches to a runner's parser."""
+    parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS, metavar="N",
+                        help=f"Attempts per call before giving up (default: {MAX_ATTEMPTS})")
+    parser.add_argument("--retry-budget", type=int, default=RUN_RETRY_BUDGET, metavar="N",
+                        help=f"Total retries allowed across the run (default: {RUN_RETRY_BUDGET})")
+
+
+def configure(args) -> None:
+    """Apply the parsed retry switches."""
+    global MAX_ATTEMPTS, budget
+    MAX_ATTEMPTS = max(1, args.max_attempts)
+    budget = RetryBudget(args.retry_budget)
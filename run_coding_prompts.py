@@ -2,13 +2,21 @@
 Run coding prompts 3-6 against GPT-5.2, Gemini 3 Pro, and DeepSeek V3.2
 """
 import os
-import re
 import json
 import time
-import requests
-from dotenv import load_dotenv
-
-load_dotenv()
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import providers
+from extract import extract_html, StreamExtractor
+import response_cache
+import retry
+import journal
+import trials
+import results_db
+import prefix_cache
+import batch
+import hedging
+import circuit
 
 # Prompts - minimal output, no extra UI
 SUFFIX = " Don't use external libraries. Output only the code. Don't include any additional text or comments. Don't have any sliders or user interface. Make the whole output fit within a 250x400px frame."
@@ -21,144 +29,53 @@ PROMPTS = {
     "blocks": "Create an HTML-only game where there are 10 blocks of different shapes and sizes scattered on the ground. You have to move the blocks and stack them into a tower without it falling over. Every few seconds, there's a mild earthquake. Use normal friction and gravity. Don't use external libraries. Output only the code. Make the whole output fit within a 200x300px frame.",
 }
 
-def extract_html(response_text):
-    """Extract HTML from markdown code blocks or return as-is."""
-    text = response_text.strip()
-
-    # Try to find complete HTML document in code blocks
-    match = re.search(r'```(?:html)?\s*(<!DOCTYPE html>.*?</html>)\s*```', text, re.DOTALL | re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
-    # Try without DOCTYPE
-    match = re.search(r'```(?:html)?\s*(<html.*?</html>)\s*```', text, re.DOTALL | re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
-
-    # Strip leading ```html or ``` markers
-    text = re.sub(r'^```(?:html)?\s*', '', text, flags=re.IGNORECASE)
-    # Strip trailing ``` markers
-    text = re.sub(r'\s*```\s*$', '', text)
-    text = text.strip()
-
-    # If it now starts with <!DOCTYPE or <html, return it
-    if text.lower().startswith('<!doctype') or text.lower().startswith('<html'):
-        return text
-
-    # Find any complete HTML document
-    match = re.search(r'(<!DOCTYPE html>.*?</html>)', text, re.DOTALL | re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
-
-    # Try to find partial HTML (canvas + script) and wrap it
-    match = re.search(r'(<canvas.*?</script>)', text, re.DOTALL | re.IGNORECASE)
-    if match:
-        partial = match.group(1)
-        return f'''<!DOCTYPE html>
-<html>
-<head>
-<meta charset="UTF-8">
-<style>* {{ margin: 0; padding: 0; }} body {{ background: #0a0a14; overflow: hidden; }} canvas {{ display: block; }}</style>
-</head>
-<body>
-{partial}
-</body>
-</html>'''
-    return text
-
-def call_openai(prompt: str) -> dict:
+def call_model(provider: str, model: str, prompt: str, stream: bool = False, trial: int = 0) -> dict:
+    """Call a provider and extract the HTML from its response.
+
+    With --hedge, calls to a provider with a second region are hedged to it.
+    """
+    def attempt(region, cancel):
+        if stream:
+            extractor = StreamExtractor()
+            result = providers.stream_call(region, model, prompt, timeout=300, on_content=extractor.feed,
+                                           trial=trial, cancel=cancel)
+            # Cached responses are returned whole rather than streamed
+            content = extractor.result() if extractor.parts else extract_html(result["content"])
+        else:
+            result = providers.call(region, model, prompt, timeout=300, trial=trial, cancel=cancel)
+            content = extract_html(result["content"])
+        return {**result, "content": content, "timing": result.get("timing", {})}
+
+    return hedging.call(provider, attempt)
+
+# (provider, API model id) behind each model key
+API_MODELS = {
+    "gpt": ("openai", "gpt-5.2"),
+    "gemini": ("gemini", "gemini-3-pro-preview"),
+    "deepseek": ("deepseek", "deepseek-reasoner"),
+    "kimi": ("kimi", "kimi-k2.5"),
+    "qwen": ("qwen", "qwen3-coder-plus"),
+}
+
+def call_openai(prompt: str, stream: bool = False, trial: int = 0) -> dict:
     """Call OpenAI API."""
-    api_key = os.getenv("OPENAI_API_KEY")
-    response = requests.post(
-        "https://api.openai.com/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        },
-        json={
-            "model": "gpt-5.2",
-            "messages": [{"role": "user", "content": prompt}],
-        },
-        timeout=300,
-    )
-    data = response.json()
-    content = data["choices"][0]["message"]["content"]
-    usage = data.get("usage", {})
-    return {"content": extract_html(content), "usage": usage}
+    return call_model(*API_MODELS["gpt"], prompt, stream, trial)
 
-def call_gemini(prompt: str) -> dict:
+def call_gemini(prompt: str, stream: bool = False, trial: int = 0) -> dict:
     """Call Google Gemini API."""
-    api_key = os.getenv("GOOGLE_API_KEY")
-    response = requests.post(
-        f"https://generativelanguage.googleapis.com/v1beta/models/gemini-3-pro-preview:generateContent?key={api_key}",
-        json={
-            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
-        },
-        timeout=300,
-    )
-    data = response.json()
-    content = data["candidates"][0]["content"]["parts"][0]["text"]
-    usage = data.get("usageMetadata", {})
-    return {"content": extract_html(content), "usage": usage}
+    return call_model(*API_MODELS["gemini"], prompt, stream, trial)
 
-def call_deepseek(prompt: str) -> dict:
+def call_deepseek(prompt: str, stream: bool = False, trial: int = 0) -> dict:
     """Call DeepSeek API."""
-    api_key = os.getenv("DEEPSEEK_API_KEY")
-    response = requests.post(
-        "https://api.deepseek.com/chat/completions",
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        },
-        json={
-            "model": "deepseek-reasoner",
-            "messages": [{"role": "user", "content": prompt}],
-        },
-        timeout=300,
-    )
-    data = response.json()
-    content = data["choices"][0]["message"]["content"]
-    usage = data.get("usage", {})
-    return {"content": extract_html(content), "usage": usage}
+    return call_model(*API_MODELS["deepseek"], prompt, stream, trial)
 
-def call_kimi(prompt: str) -> dict:
+def call_kimi(prompt: str, stream: bool = False, trial: int = 0) -> dict:
     """Call Kimi (Moonshot) API."""
-    api_key = os.getenv("KIMI_API_KEY")
-    response = requests.post(
-        "https://api.moonshot.ai/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        },
-        json={
-            "model": "kimi-k2.5",
-            "messages": [{"role": "user", "content": prompt}],
-        },
-        timeout=300,
-    )
-    data = response.json()
-    content = data["choices"][0]["message"]["content"]
-    usage = data.get("usage", {})
-    return {"content": extract_html(content), "usage": usage}
+    return call_model(*API_MODELS["kimi"], prompt, stream, trial)
 
-def call_qwen(prompt: str) -> dict:
+def call_qwen(prompt: str, stream: bool = False, trial: int = 0) -> dict:
     """Call Qwen API (US-Virginia endpoint) - uses coder model for coding prompts."""
-    api_key = os.getenv("QWEN_API_KEY")
-    response = requests.post(
-        "https://dashscope-us.aliyuncs.com/compatible-mode/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        },
-        json={
-            "model": "qwen3-coder-plus",
-            "messages": [{"role": "user", "content": prompt}],
-        },
-        timeout=300,
-    )
-    data = response.json()
-    content = data["choices"][0]["message"]["content"]
-    usage = data.get("usage", {})
-    return {"content": extract_html(content), "usage": usage}
+    return call_model(*API_MODELS["qwen"], prompt, stream, trial)
 
 MODELS = {
     "gpt": ("GPT-5.2", call_openai),
@@ -168,6 +85,112 @@ MODELS = {
     "qwen": ("Qwen3-Coder-Plus", call_qwen),
 }
 
+# Max in-flight requests per provider when running concurrently
+PROVIDER_CONCURRENCY = {
+    "gpt": 5,
+    "gemini": 5,
+    "deepseek": 3,
+    "kimi": 3,
+    "qwen": 3,
+}
+
+# Trial number of the cold (fresh-connection) sample taken with --cold
+COLD_TRIAL = -1
+
+def prompt_text(prompt_name: str, cache_layout: bool = False) -> str:
+    """The prompt as sent; cache_layout puts the shared SUFFIX first so providers can cache it."""
+    if cache_layout:
+        return prefix_cache.cache_first(PROMPTS[prompt_name], SUFFIX)
+    return PROMPTS[prompt_name]
+
+def timed_call(model_key: str, prompt: str, stream: bool = False, trial: int = 0) -> tuple:
+    """Run one model call, returning (result, elapsed seconds).
+
+    Cached responses report the elapsed time of the original call.
+    """
+    result = MODELS[model_key][1](prompt, stream=stream, trial=trial)
+    return result, result["elapsed"]
+
+def call_stats(result: dict, elapsed: float, cache_layout: bool = False) -> dict:
+    """The stats record for one call; cache_layout marks a prompt sent shared-prefix first."""
+    return {
+        **({"prompt_layout": prefix_cache.CACHE_FIRST} if cache_layout else {}),
+        "usage": result["usage"],
+        "time_seconds": round(elapsed, 1),
+        **{k: v for k, v in result["timing"].items() if v is not None},
+        **({"batch_id": result["batch_id"]} if result.get("batch_id") else {}),
+        **({"http": result["http"]} if result.get("http") else {}),
+        **({"hedge": result["hedge"]} if result.get("hedge") else {}),
+    }
+
+def prewarm(model_keys: list, concurrency: int) -> None:
+    """Open each provider's connections before timing starts, so no timed call pays for setup."""
+    for model_key in model_keys:
+        provider = API_MODELS[model_key][0]
+        try:
+            setups = providers.prewarm(provider, min(concurrency, PROVIDER_CONCURRENCY.get(model_key, 1)))
+        except Exception as e:
+            print(f"[{MODELS[model_key][0]}] Pre-warm failed: {e}")
+            continue
+        if setups:
+            seconds = [sum(v or 0 for v in setup.values()) for setup in setups]
+            print(f"[{MODELS[model_key][0]}] Pre-warmed {len(setups)} connection(s) to {provider} "
+                  f"(setup {max(seconds):.2f}s)")
+
+def call_label(prompt_name: str, trial: int, trial_count: int) -> str:
+    return f"{prompt_name} (trial {trial + 1}/{trial_count})" if trial_count > 1 else prompt_name
+
+async def run_matrix(calls: list, concurrency: int, stream: bool = False, on_done=None,
+                     trial_count: int = 1, cache_layout: bool = False) -> list:
+    """Run (prompt_name, model_key, trial) calls concurrently.
+
+    Each call runs in a worker thread, gated by a global cap and a
+    per-provider cap. Timing happens inside the thread, so time spent
+    waiting for a slot is not counted. on_done(prompt_name, model_key,
+    trial, result, elapsed) is called as each call succeeds. Returns
+    (result, elapsed) or the raised exception for each call, in input order.
+
+    With cache_layout, prompts are sent shared-prefix first.
+    """
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+    overall = asyncio.Semaphore(concurrency)
+    per_model = {key: asyncio.Semaphore(min(concurrency, PROVIDER_CONCURRENCY.get(key, 1)))
+                 for key in MODELS}
+
+    async def run_call(prompt_name, model_key, trial):
+        async with per_model[model_key], overall:
+            model_name = MODELS[model_key][0]
+            label = call_label(prompt_name, trial, trial_count)
+            print(f"[{model_name}] Starting {label}...", flush=True)
+            prompt = prompt_text(prompt_name, cache_layout)
+            result = await asyncio.to_thread(timed_call, model_key, prompt, stream, trial)
+            print(f"[{model_name}] Finished {label} ({result[1]:.1f}s)", flush=True)
+            if on_done:
+                on_done(prompt_name, model_key, trial, *result)
+            return result
+
+    return await asyncio.gather(*(run_call(*call) for call in calls), return_exceptions=True)
+
+def run_batch(calls: list, cache_layout: bool = False, poll_interval: float = batch.POLL_INTERVAL) -> list:
+    """Run (prompt_name, model_key, trial) calls through the providers' batch APIs.
+
+    Returns (result, elapsed) or the exception for each call, in input
+    order, like run_matrix(); elapsed is the batch job's turnaround.
+    """
+    requests = [(f"{prompt_name}:{model_key}:{trial}", *API_MODELS[model_key],
+                 prompt_text(prompt_name, cache_layout), trial)
+                for prompt_name, model_key, trial in calls]
+    results = batch.run(requests, poll_interval)
+    outcomes = []
+    for custom_id, *_ in requests:
+        result = results[custom_id]
+        if isinstance(result, Exception):
+            outcomes.append(result)
+        else:
+            outcomes.append(({**result, "content": extract_html(result["content"]), "timing": {}},
+                             result["elapsed"]))
+    return outcomes
+
 if __name__ == "__main__":
     import sys
     import argparse
@@ -181,6 +204,16 @@ Examples:
   python run_coding_prompts.py -p animation flow         # Run only animation and flow prompts
   python run_coding_prompts.py -m gpt deepseek           # Run only GPT and DeepSeek
   python run_coding_prompts.py -p traffic -m gemini      # Run traffic prompt on Gemini only
+  python run_coding_prompts.py --concurrency 10          # Run the whole matrix concurrently
+  python run_coding_prompts.py --stream                  # Stream responses and record TTFT and tokens/s
+  python run_coding_prompts.py --refresh                 # Ignore cached responses and call the APIs again
+  python run_coding_prompts.py --resume                  # Continue an interrupted run
+  python run_coding_prompts.py --trials 5                # Five samples per cell, with percentiles and CIs
+  python run_coding_prompts.py --prefix-cache            # Shared instructions first, to hit provider prompt caches
+  python run_coding_prompts.py --batch                   # Submit batch jobs where providers support them
+  python run_coding_prompts.py --cold                    # Also time one call per model on a cold connection
+  python run_coding_prompts.py --hedge -m qwen           # Hedge slow Qwen calls to the China region
+  python run_coding_prompts.py --breaker-threshold 5     # Stop calling a provider after 5 failures in a row
   python run_coding_prompts.py --list                    # Show available prompts and models
         """
     )
@@ -188,6 +221,32 @@ Examples:
                         help="Prompts to run (default: all)")
     parser.add_argument("-m", "--models", nargs="+", choices=list(MODELS.keys()),
                         help="Models to test (default: all)")
+    parser.add_argument("--concurrency", type=int, default=1, metavar="N",
+                        help="Run up to N calls at once across the prompt x model matrix (default: 1, sequential)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream responses and record TTFB, TTFT, reasoning time and tokens/s")
+    parser.add_argument("--trials", type=int, default=1, metavar="N",
+                        help="Run each prompt/model N times (concurrently) and record latency percentiles")
+    parser.add_argument("--prefix-cache", action="store_true",
+                        help="Send the shared instructions first, so providers can cache them, and report "
+                             "cache hits")
+    parser.add_argument("--batch", action="store_true",
+                        help="Submit the matrix as discounted batch jobs (OpenAI, Gemini, Qwen) and poll "
+                             "until they finish; other providers are called as usual")
+    parser.add_argument("--poll-interval", type=float, default=batch.POLL_INTERVAL, metavar="SECONDS",
+                        help=f"Seconds between batch status checks (default: {batch.POLL_INTERVAL})")
+    parser.add_argument("--no-prewarm", action="store_true",
+                        help="Don't open provider connections before timing starts")
+    parser.add_argument("--cold", action="store_true",
+                        help="First time one call per model on a fresh connection (recorded as \"cold\")")
+    parser.add_argument("--output-dir", metavar="DIR",
+                        help="Write .html files, stats.json and the journal here (default: the app directory)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip calls already completed in stats_journal.jsonl (e.g. after a crash)")
+    response_cache.add_arguments(parser)
+    retry.add_arguments(parser)
+    hedging.add_arguments(parser)
+    circuit.add_arguments(parser)
     parser.add_argument("--list", action="store_true",
                         help="List available prompts and models")
     args = parser.parse_args()
@@ -197,62 +256,223 @@ Examples:
         print("Available models:", ", ".join(MODELS.keys()))
         sys.exit(0)
 
+    response_cache.configure(args)
+    retry.configure(args)
+    circuit.configure(args)
+    trial_count = max(1, args.trials)
+    if trial_count > 1 and args.concurrency == 1:
+        args.concurrency = trial_count
     selected_prompts = args.prompts or list(PROMPTS.keys())
     selected_models = args.models or list(MODELS.keys())
 
-    app_dir = os.path.dirname(os.path.abspath(__file__))
+    app_dir = args.output_dir or os.path.dirname(os.path.abspath(__file__))
+    os.makedirs(app_dir, exist_ok=True)
     stats_file = os.path.join(app_dir, "stats.json")
+    journal_file = os.path.join(app_dir, "stats_journal.jsonl")
 
     # Load existing stats or create new
     if os.path.exists(stats_file):
         with open(stats_file, "r") as f:
-            all_stats = json.load(f)
+            base_stats = json.load(f)
     else:
-        all_stats = {}
+        base_stats = {}
+
+    calls = [(p, m, t) for p in selected_prompts for m in selected_models for t in range(trial_count)]
+    # Cold samples are journaled too, but kept apart from the timed matrix
+    cold_records = []
+    if args.resume:
+        completed = journal.load(journal_file)
+        cold_records = [r for r in completed if r.get("cold")]
+        completed = [r for r in completed if not r.get("cold")]
+        done = {(r["prompt"], r["model"], r.get("trial", 0)) for r in completed}
+        skipped = [call for call in calls if call in done]
+        calls = [call for call in calls if call not in done]
+        print(f"Resuming: {len(skipped)} calls already in the journal, {len(calls)} to run")
+    else:
+        completed = []
+        journal.reset(journal_file)
+
+    db = results_db.ResultsDB(os.path.join(app_dir, "results.db"))
+    run_id = db.start_run("run_coding_prompts", vars(args), resume=args.resume)
+    # Hedge delays start from each provider's latencies in earlier runs
+    hedging.configure(args, {API_MODELS[m][0]: db.recent_latencies(m, "coding")
+                             for m in selected_models if hedging.alternate(API_MODELS[m][0])})
 
     print(f"Running prompts: {', '.join(selected_prompts)}")
     print(f"Testing models: {', '.join(selected_models)}")
+    if trial_count > 1:
+        print(f"Trials per cell: {trial_count}")
+
+    matrix_order = {(p, m): i for i, (p, m) in enumerate((p, m) for p in PROMPTS for m in MODELS)}
+
+    def rebuild_stats():
+        """Rebuild stats.json from the starting stats plus every journaled result."""
+        all_stats = json.loads(json.dumps(base_stats))
+        cells = {}
+        for record in completed:
+            cells.setdefault((record["prompt"], record["model"]), []).append(record)
+        # Apply in matrix order so the file matches a sequential run
+        for cell in sorted(cells, key=lambda pair: matrix_order.get(pair, 0)):
+            records = cells[cell]
+            if len(records) == 1 and "trial" not in records[0]:
+                cell_stats = records[0]["stats"]
+            else:
+                cell_stats = trials.merge([r["stats"] for r in sorted(records, key=lambda r: r.get("trial", 0))])
+            all_stats.setdefault(cell[0], {})[cell[1]] = cell_stats
+        for record in cold_records:
+            cell_stats = all_stats.get(record["prompt"], {}).get(record["model"])
+            if cell_stats is not None:
+                cell_stats["cold"] = record["stats"]
+        journal.write_json_atomic(stats_file, all_stats, indent=2)
+
+    # Stats of the calls made in this run, for the prompt-cache report
+    run_records = []
 
-    total_prompts = len(selected_prompts)
-    for i, prompt_name in enumerate(selected_prompts, 1):
-        prompt_text = PROMPTS[prompt_name]
-        print(f"\n{'='*60}")
-        print(f"[{i}/{total_prompts}] Running: {prompt_name}")
-        print(f"{'='*60}")
-        sys.stdout.flush()
-
-        if prompt_name not in all_stats:
-            all_stats[prompt_name] = {}
-
-        for model_key in selected_models:
-            model_name, model_func = MODELS[model_key]
-            print(f"\n[{model_name}] Starting API call...", end=" ", flush=True)
-            try:
-                start_time = time.time()
-                result = model_func(prompt_text)
-                elapsed = time.time() - start_time
-
-                filepath = os.path.join(app_dir, f"{prompt_name}_{model_key}.html")
-                with open(filepath, "w", encoding="utf-8") as f:
-                    f.write(result["content"])
-                print(f"Done! ({elapsed:.1f}s)")
-                print(f"  Saved to {prompt_name}_{model_key}.html")
-                print(f"  Usage: {result['usage']}")
-
-                # Save stats
-                all_stats[prompt_name][model_key] = {
-                    "usage": result["usage"],
-                    "time_seconds": round(elapsed, 1)
-                }
-            except Exception as e:
-                print(f"ERROR!")
-                print(f"  {e}")
+    def save_result(prompt_name, model_key, trial, result, elapsed):
+        # Later trials are latency samples; the first trial's artifact is the one shown
+        if trial == 0:
+            filepath = os.path.join(app_dir, f"{prompt_name}_{model_key}.html")
+            journal.write_atomic(filepath, result["content"])
+            print(f"  Saved to {prompt_name}_{model_key}.html")
+        if result.get("cached_at"):
+            print(f"  Cached response from {result['cached_at']}")
+        if result.get("retries"):
+            print(f"  Succeeded after {result['retries']} retries")
+        print(f"  Usage: {result['usage']}")
+        if result["timing"]:
+            print(f"  Timing: {result['timing']}")
+
+        # Journal the result, then save stats
+        record = {
+            "prompt": prompt_name,
+            "model": model_key,
+            **({"trial": trial} if trial_count > 1 else {}),
+            "stats": call_stats(result, elapsed, args.prefix_cache),
+        }
+        journal.append(journal_file, record)
+        db.record_call(run_id, prompt_name, model_key, record["stats"], result["content"],
+                       prompt_type="coding", prompt_text=PROMPTS[prompt_name],
+                       trial=trial)
+        run_records.append({"model": model_key, **record["stats"]})
+        completed.append(record)
+        rebuild_stats()
+
+    # Calls skipped while their provider's circuit was open; they are not
+    # journaled, so --resume runs them again
+    skipped_calls = []
+
+    def record_skip(prompt_name, model_key, trial, error):
+        db.record_call(run_id, prompt_name, model_key, {"error": str(error)}, status="skipped",
+                       prompt_type="coding", prompt_text=PROMPTS[prompt_name],
+                       trial=trial)
+        skipped_calls.append((prompt_name, model_key, trial))
+
+    if args.cold:
+        # One call per model before anything is pre-warmed, so it pays the full setup
+        cold_prompt = selected_prompts[0]
+        cold_done = {r["model"] for r in cold_records if r["prompt"] == cold_prompt}
+        cold_models = [m for m in selected_models if m not in cold_done]
+        if cold_models:
+            print(f"\nCold calls ({cold_prompt}): {', '.join(cold_models)}", flush=True)
+            with ThreadPoolExecutor(max_workers=len(cold_models)) as pool:
+                futures = {m: pool.submit(timed_call, m, prompt_text(cold_prompt, args.prefix_cache),
+                                          args.stream, COLD_TRIAL)
+                           for m in cold_models}
+            for model_key, future in futures.items():
+                try:
+                    result, elapsed = future.result()
+                except Exception as e:
+                    print(f"[{MODELS[model_key][0]}] Cold call: ERROR!\n  {e}")
+                    continue
+                print(f"[{MODELS[model_key][0]}] Cold call {elapsed:.1f}s")
+                record = {"prompt": cold_prompt, "model": model_key, "cold": True,
+                          "stats": call_stats(result, elapsed, args.prefix_cache)}
+                journal.append(journal_file, record)
+                db.record_call(run_id, cold_prompt, model_key, record["stats"], status="cold",
+                               prompt_type="coding", prompt_text=PROMPTS[cold_prompt])
+                cold_records.append(record)
+
+    if not args.no_prewarm:
+        print()
+        prewarm(selected_models, args.concurrency)
+
+    batch_calls = []
+    if args.batch:
+        batch_calls = [call for call in calls if batch.supports(API_MODELS[call[1]][0])]
+        calls = [call for call in calls if call not in batch_calls]
+        if batch_calls:
+            print(f"Submitting {len(batch_calls)} calls as batch jobs; {len(calls)} run directly\n")
+    # Batch jobs are polled in the background while the direct calls run
+    batch_pool = ThreadPoolExecutor(max_workers=1)
+    batch_future = batch_pool.submit(run_batch, batch_calls, args.prefix_cache, args.poll_interval)
+
+    if args.concurrency > 1:
+        print(f"Running {len(calls)} calls with concurrency {args.concurrency}\n")
+        run_start = time.monotonic()
+        outcomes = asyncio.run(run_matrix(calls, args.concurrency, args.stream, on_done=save_result,
+                                          trial_count=trial_count, cache_layout=args.prefix_cache))
+        print(f"\nAll calls finished in {time.monotonic() - run_start:.1f}s")
+
+        for (prompt_name, model_key, trial), outcome in zip(calls, outcomes):
+            label = call_label(prompt_name, trial, trial_count)
+            if isinstance(outcome, circuit.CircuitOpenError):
+                print(f"\n[{MODELS[model_key][0]}] {label}: Skipped: {outcome}")
+                record_skip(prompt_name, model_key, trial, outcome)
+            elif isinstance(outcome, Exception):
+                print(f"\n[{MODELS[model_key][0]}] {label}: ERROR!")
+                print(f"  {outcome}")
+    else:
+        total_prompts = len(selected_prompts)
+        for i, prompt_name in enumerate(selected_prompts, 1):
+            print(f"\n{'='*60}")
+            print(f"[{i}/{total_prompts}] Running: {prompt_name}")
+            print(f"{'='*60}")
             sys.stdout.flush()
 
-    # Save stats to JSON
-    with open(stats_file, "w") as f:
-        json.dump(all_stats, f, indent=2)
-    print(f"\nStats saved to stats.json")
+            for model_key in selected_models:
+                model_name = MODELS[model_key][0]
+                for trial in range(trial_count):
+                    if (prompt_name, model_key, trial) not in calls:
+                        continue
+                    print(f"\n[{model_name}] Starting API call...", end=" ", flush=True)
+                    try:
+                        prompt = prompt_text(prompt_name, args.prefix_cache)
+                        result, elapsed = timed_call(model_key, prompt, args.stream, trial)
+                        print(f"Done! ({elapsed:.1f}s)")
+                        save_result(prompt_name, model_key, trial, result, elapsed)
+                    except circuit.CircuitOpenError as e:
+                        print(f"Skipped: {e}")
+                        record_skip(prompt_name, model_key, trial, e)
+                    except Exception as e:
+                        print(f"ERROR!")
+                        print(f"  {e}")
+                    sys.stdout.flush()
+
+    if batch_calls:
+        print("\nWaiting for batch jobs...", flush=True)
+    for (prompt_name, model_key, trial), outcome in zip(batch_calls, batch_future.result()):
+        label = call_label(prompt_name, trial, trial_count)
+        if isinstance(outcome, circuit.CircuitOpenError):
+            print(f"\n[{MODELS[model_key][0]}] {label} (batch): Skipped: {outcome}")
+            record_skip(prompt_name, model_key, trial, outcome)
+            continue
+        if isinstance(outcome, Exception):
+            print(f"\n[{MODELS[model_key][0]}] {label} (batch): ERROR!")
+            print(f"  {outcome}")
+            continue
+        print(f"\n[{MODELS[model_key][0]}] {label} (batch, {outcome[1]:.0f}s)")
+        save_result(prompt_name, model_key, trial, *outcome)
+    batch_pool.shutdown()
+
+    rebuild_stats()
+    if skipped_calls:
+        print(f"\nSkipped {len(skipped_calls)} calls while a provider's circuit was open; "
+              f"re-run with --resume to retry them")
+    if run_records:
+        prefix_cache.print_report(prefix_cache.report(run_records))
+    db.finish_run(run_id)
+    db.close()
+    print(f"\nStats saved to stats.json and results.db (run {run_id})")
 
     print(f"\n{'='*60}")
     print("Done! All selected prompts processed.")
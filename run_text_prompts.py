@@ -5,9 +5,17 @@ import os
 import json
 import time
 import requests
-from dotenv import load_dotenv
-
-load_dotenv()
+from concurrent.futures import ThreadPoolExecutor
+import providers
+import response_cache
+import retry
+import journal
+import trials
+import results_db
+import batch
+import hedging
+import circuit
+import dashboard
 
 PROMPTS = {
     "prompt6": "Are there any Rs in star",
@@ -22,63 +30,203 @@ PROMPTS = {
     "prompt15": "In one sentence, give an example of a scenario where it's ethical for the government to lie to the public to protect public safety.",
 }
 
-def call_qwen_max(prompt: str) -> dict:
-    """Call Qwen3-Max API (US-Virginia endpoint)."""
-    api_key = os.getenv("QWEN_API_KEY")
-    response = requests.post(
-        "https://dashscope-us.aliyuncs.com/compatible-mode/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        },
-        json={
-            "model": "qwen3-max",
-            "messages": [{"role": "user", "content": prompt}],
-        },
-        timeout=120,
-    )
-    data = response.json()
-
-    if response.status_code != 200:
-        return {"content": f"Error {response.status_code}: {data.get('error', {}).get('message', 'Unknown error')}", "usage": {}, "error": True}
-
-    content = data["choices"][0]["message"]["content"]
-    usage = data.get("usage", {})
-    return {"content": content, "usage": usage}
+PROVIDER, MODEL = "qwen", "qwen3-max"
+
+def call_qwen_max(prompt: str, trial: int = 0) -> dict:
+    """Call Qwen3-Max API (US-Virginia endpoint, hedged to China with --hedge)."""
+    try:
+        return hedging.call(PROVIDER, lambda region, cancel: providers.call(region, MODEL, prompt, timeout=120,
+                                                                            trial=trial, cancel=cancel))
+    except (providers.ProviderError, requests.RequestException) as e:
+        return {"content": str(e), "usage": {}, "error": True}
+    except circuit.CircuitOpenError as e:
+        return {"content": str(e), "usage": {}, "skipped": True}
+
+def run_trial(prompt_text: str, trial: int) -> dict:
+    """One timed call, as a results-file record."""
+    start_time = time.monotonic()
+    result = call_qwen_max(prompt_text, trial)
+    # Cached responses carry the elapsed time of the original call
+    elapsed = result.get("elapsed", time.monotonic() - start_time)
+    return {
+        "prompt": prompt_text,
+        "response": result["content"],
+        "usage": result["usage"],
+        "time_seconds": round(elapsed, 1),
+        **({"http": result["http"]} if result.get("http") else {}),
+        **({"hedge": result["hedge"]} if result.get("hedge") else {}),
+        **({"error": True} if result.get("error") else {}),
+        **({"skipped": True} if result.get("skipped") else {}),
+    }
+
+def run_batch(pending: list, poll_interval: float = batch.POLL_INTERVAL) -> dict:
+    """Ask (prompt_name, trial) pairs in one batch job; returns {(prompt_name, trial): record}."""
+    results = batch.run([(f"{name}:{trial}", PROVIDER, MODEL, PROMPTS[name], trial) for name, trial in pending],
+                        poll_interval)
+    records = {}
+    for name, trial in pending:
+        result = results[f"{name}:{trial}"]
+        if isinstance(result, circuit.CircuitOpenError):
+            result = {"content": str(result), "usage": {}, "elapsed": 0, "skipped": True}
+        elif isinstance(result, Exception):
+            result = {"content": str(result), "usage": {}, "elapsed": 0, "error": True}
+        records[(name, trial)] = {
+            "prompt": PROMPTS[name],
+            "response": result["content"],
+            "usage": result["usage"],
+            "time_seconds": round(result["elapsed"], 1),
+            **({"batch_id": result["batch_id"]} if result.get("batch_id") else {}),
+            **({"error": True} if result.get("error") else {}),
+            **({"skipped": True} if result.get("skipped") else {}),
+        }
+    return records
+
+def merge_trials(records: dict) -> dict:
+    """Collapse {trial: record} into trial 0's answer plus latency percentiles."""
+    ordered = [records[trial] for trial in sorted(records)]
+    samples = [{k: r[k] for k in ("usage", "time_seconds", "hedge") if k in r} for r in ordered]
+    return trials.merge(samples, base=ordered[0])
 
 if __name__ == "__main__":
     import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run text prompts against Qwen3-Max")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip prompts already completed in qwen_text_journal.jsonl (e.g. after a crash)")
+    parser.add_argument("--trials", type=int, default=1, metavar="N",
+                        help="Ask each prompt N times (concurrently) and record latency percentiles")
+    parser.add_argument("--no-prewarm", action="store_true",
+                        help="Don't open the Qwen connections before timing starts")
+    parser.add_argument("--batch", action="store_true",
+                        help="Ask every prompt in one discounted batch job and poll until it finishes")
+    parser.add_argument("--poll-interval", type=float, default=batch.POLL_INTERVAL, metavar="SECONDS",
+                        help=f"Seconds between batch status checks (default: {batch.POLL_INTERVAL})")
+    response_cache.add_arguments(parser)
+    retry.add_arguments(parser)
+    hedging.add_arguments(parser)
+    circuit.add_arguments(parser)
+    args = parser.parse_args()
+    response_cache.configure(args)
+    retry.configure(args)
+    circuit.configure(args)
 
-    results = {}
+    # Next to the app, wherever the runner is started from, so the dashboard sees the results
+    results_file = dashboard.text_results_path("qwen")
+    journal_file = os.path.join(dashboard.APP_DIR, "qwen_text_journal.jsonl")
 
-    for prompt_name, prompt_text in PROMPTS.items():
-        print(f"\n{'='*60}", flush=True)
-        print(f"Running: {prompt_name}", flush=True)
-        print(f"{'='*60}", flush=True)
+    trial_count = max(1, args.trials)
+    db = results_db.ResultsDB(results_db.DB_FILE)
+    run_id = db.start_run("run_text_prompts", vars(args), resume=args.resume)
+    hedging.configure(args, {PROVIDER: db.recent_latencies("qwen", "text")})
+    # {prompt_name: {trial: record}}
+    trial_results = {}
+    if args.resume:
+        for record in journal.load(journal_file):
+            trial_results.setdefault(record["prompt_name"], {})[record.get("trial", 0)] = record["result"]
+        print(f"Resuming: {len(trial_results)} prompts already in the journal", flush=True)
+    else:
+        journal.reset(journal_file)
 
-        start_time = time.time()
-        result = call_qwen_max(prompt_text)
-        elapsed = time.time() - start_time
+    # Answers from earlier runs stay until a prompt is rerun, and their
+    # hand-curated display text and flags stay while the answer is unchanged
+    base_results = {}
+    if os.path.exists(results_file):
+        with open(results_file, "r", encoding="utf-8") as f:
+            base_results = json.load(f)
 
+    def save_results():
+        # Keep results in prompt order, as a single uninterrupted run would
+        results = {}
+        for name in PROMPTS:
+            if name in trial_results:
+                records = trial_results[name]
+                record = merge_trials(records) if trial_count > 1 else records[0]
+                results[name] = dashboard.with_curation(record, base_results.get(name))
+            elif name in base_results:
+                results[name] = base_results[name]
+        for name, record in base_results.items():
+            results.setdefault(name, record)
+        journal.write_json_atomic(results_file, results, indent=2, ensure_ascii=False)
+
+    # Trials that failed, or were skipped while the Qwen circuit was open; neither
+    # is journaled, so --resume asks them again
+    failed_trials = []
+    skipped_trials = []
+
+    def store(prompt_name, pending, records):
+        for trial, record in zip(pending, records):
+            if record.get("skipped"):
+                db.record_call(run_id, prompt_name, "qwen", {"error": record["response"]}, status="skipped",
+                               prompt_type="text", prompt_text=PROMPTS[prompt_name], trial=trial)
+                print(f"[Qwen3-Max] Skipped: {record['response']}", flush=True)
+                skipped_trials.append((prompt_name, trial))
+                continue
+            if record.get("error"):
+                print(f"[Qwen3-Max] ERROR!\n  {record['response']}", flush=True)
+                failed_trials.append((prompt_name, trial))
+                continue
+            trial_results.setdefault(prompt_name, {})[trial] = record
+            entry = {"prompt_name": prompt_name, "result": record}
+            if trial_count > 1:
+                entry["trial"] = trial
+            journal.append(journal_file, entry)
+            stats = {k: record[k] for k in ("usage", "time_seconds", "batch_id", "http", "hedge") if k in record}
+            db.record_call(run_id, prompt_name, "qwen", stats, record["response"],
+                           prompt_type="text", prompt_text=PROMPTS[prompt_name], trial=trial)
         # Store result regardless of print issues
-        results[prompt_name] = {
-            "prompt": prompt_text,
-            "response": result["content"],
-            "usage": result["usage"],
-            "time_seconds": round(elapsed, 1)
-        }
+        save_results()
 
         # Try to print, but don't fail if encoding issues
+        for trial, record in zip(pending, records):
+            if record.get("skipped") or record.get("error"):
+                continue
+            elapsed = record["time_seconds"]
+            try:
+                preview = record["response"][:200].encode('ascii', 'replace').decode('ascii')
+                print(f"[Qwen3-Max] Done ({elapsed:.1f}s): {preview}...", flush=True)
+            except:
+                print(f"[Qwen3-Max] Done ({elapsed:.1f}s) - response saved", flush=True)
+
+    if not args.no_prewarm and not args.batch:
+        # Connection setup happens here rather than inside the first timed call
         try:
-            preview = result["content"][:200].encode('ascii', 'replace').decode('ascii')
-            print(f"[Qwen3-Max] Done ({elapsed:.1f}s): {preview}...", flush=True)
-        except:
-            print(f"[Qwen3-Max] Done ({elapsed:.1f}s) - response saved", flush=True)
+            providers.prewarm(PROVIDER, trial_count)
+        except Exception as e:
+            print(f"Pre-warm failed: {e}", flush=True)
+
+    pending_trials = {name: [t for t in range(trial_count) if t not in trial_results.get(name, {})]
+                      for name in PROMPTS}
+    if args.batch:
+        pending = [(name, trial) for name, trials_left in pending_trials.items() for trial in trials_left]
+        print(f"Submitting {len(pending)} calls as a batch job", flush=True)
+        batch_records = run_batch(pending, args.poll_interval)
+        for prompt_name, trials_left in pending_trials.items():
+            if trials_left:
+                store(prompt_name, trials_left, [batch_records[(prompt_name, t)] for t in trials_left])
+    else:
+        for prompt_name, prompt_text in PROMPTS.items():
+            pending = pending_trials[prompt_name]
+            if not pending:
+                continue
+            print(f"\n{'='*60}", flush=True)
+            print(f"Running: {prompt_name}" + (f" ({len(pending)} trials)" if trial_count > 1 else ""),
+                  flush=True)
+            print(f"{'='*60}", flush=True)
+
+            with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+                records = list(pool.map(lambda trial: run_trial(prompt_text, trial), pending))
+            store(prompt_name, pending, records)
+
+    db.finish_run(run_id)
+    db.close()
 
-    # Save results to JSON
-    with open("qwen_text_results.json", "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    if failed_trials:
+        print(f"\n{len(failed_trials)} calls failed; re-run with --resume to retry them")
+    if skipped_trials:
+        print(f"\nSkipped {len(skipped_trials)} calls while the Qwen circuit was open; "
+              f"re-run with --resume to retry them")
 
     print(f"\n{'='*60}")
-    print("Done! Results saved to qwen_text_results.json")
+    print("Done! Results saved to qwen_text_results.json and results.db")
     print(f"{'='*60}")
@@ -0,0 +1,73 @@
+"""
+Summaries of repeated trials: latency percentiles and bootstrap CIs.
+
+With --trials N each (prompt, model) cell keeps every sample. merge()
+collapses them into one stats record whose headline numbers are medians,
+with p50/p90/p99 and a bootstrap confidence interval for the median
+under "trials". Resampling is done in a single vectorized NumPy draw.
+"""
+import numpy as np
+import usage as usage_lib
+
+PERCENTILES = (50, 90, 99)
+BOOTSTRAP_RESAMPLES = 2000
+CONFIDENCE = 0.95
+
+# Per-sample fields that get a percentile summary
+SUMMARY_FIELDS = ("time_seconds", "ttft_seconds", "tokens_per_second")
+
+
+def bootstrap_ci(values, resamples: int = BOOTSTRAP_RESAMPLES, confidence: float = CONFIDENCE,
+                 seed: int = 0) -> tuple:
+    """Percentile-bootstrap confidence interval for the median."""
+    values = np.asarray(values, dtype=float)
+    rng = np.random.default_rng(seed)
+    draws = values[rng.integers(0, len(values), size=(resamples, len(values)))]
+    medians = np.median(draws, axis=1)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(medians, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def summarize(values) -> dict:
+    """p50/p90/p99, mean and a CI for the median of a list of samples (None if empty)."""
+    values = np.array([v for v in values if v is not None], dtype=float)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None
+    summary = {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+    summary["mean"] = round(float(values.mean()), 2)
+    summary["ci95"] = [round(bound, 2) for bound in bootstrap_ci(values)]
+    summary["n"] = len(values)
+    return summary
+
+
+def sample_tokens_per_second(stats: dict):
+    """Measured decode speed if the call was streamed, else output tokens over wall-clock time."""
+    if stats.get("tokens_per_second") is not None:
+        return stats["tokens_per_second"]
+    seconds = stats.get("time_seconds")
+    if not seconds:
+        return None
+    return round(usage_lib.normalize(stats.get("usage")).billed_output_tokens / seconds, 1)
+
+
+def merge(samples: list, base: dict = None) -> dict:
+    """Collapse per-trial stats (trial 0 first) into one record.
+
+    Usage and any other fields come from base (default: trial 0, the one
+    whose artifact is saved); time and tokens/s are replaced by the medians.
+    """
+    record = dict(base or samples[0])
+    summaries = {}
+    for field in SUMMARY_FIELDS:
+        if field == "tokens_per_second":
+            values = [sample_tokens_per_second(s) for s in samples]
+        else:
+            values = [s.get(field) for s in samples]
+        summary = summarize(values)
+        if summary:
+            summaries[field] = summary
+            record[field] = summary["p50"]
+    record["trials"] = {"n": len(samples), **summaries, "samples": samples}
+    return record
@@ -0,0 +1,59 @@
+"""
+One token-usage record for every provider's usage schema.
+
+OpenAI-compatible APIs report prompt_tokens/completion_tokens (with
+reasoning counted inside completion_tokens, and cache hits in
+prompt_tokens_details, prompt_cache_hit_tokens or cached_tokens
+depending on the vendor); Gemini reports promptTokenCount,
+candidatesTokenCount and a separate thoughtsTokenCount. normalize()
+maps either onto a Usage, so callers never branch on the schema.
+"""
+from typing import NamedTuple
+
+
+class Usage(NamedTuple):
+    input_tokens: int = 0         # all prompt tokens, including cache hits
+    cached_input_tokens: int = 0  # prompt tokens served from the provider's prompt cache
+    output_tokens: int = 0        # visible answer tokens
+    reasoning_tokens: int = 0     # hidden or streamed reasoning, billed as output
+
+    @property
+    def billed_output_tokens(self) -> int:
+        return self.output_tokens + self.reasoning_tokens
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.billed_output_tokens
+
+
+def from_openai(usage: dict) -> Usage:
+    """Usage from an OpenAI-compatible response (OpenAI, DeepSeek, Kimi, Qwen)."""
+    prompt = usage.get("prompt_tokens") or 0
+    completion = usage.get("completion_tokens") or 0
+    prompt_details = usage.get("prompt_tokens_details") or {}
+    completion_details = usage.get("completion_tokens_details") or {}
+    cached = (prompt_details.get("cached_tokens")
+              or usage.get("prompt_cache_hit_tokens")  # DeepSeek
+              or usage.get("cached_tokens")            # Moonshot
+              or 0)
+    reasoning = completion_details.get("reasoning_tokens") or 0
+    return Usage(prompt, min(cached, prompt), max(0, completion - reasoning), reasoning)
+
+
+def from_gemini(usage: dict) -> Usage:
+    """Usage from a Gemini usageMetadata block."""
+    return Usage(
+        usage.get("promptTokenCount") or 0,
+        usage.get("cachedContentTokenCount") or 0,
+        usage.get("candidatesTokenCount") or 0,
+        usage.get("thoughtsTokenCount") or 0,
+    )
+
+
+def normalize(usage: dict) -> Usage:
+    """Usage from either schema (an empty or missing usage is all zeros)."""
+    if not usage:
+        return Usage()
+    if "promptTokenCount" in usage or "candidatesTokenCount" in usage:
+        return from_gemini(usage)
+    return from_openai(usage)